@@ -0,0 +1,97 @@
+-- name: CaptureSessionByVisitorID :one
+WITH u AS (
+    INSERT INTO users (id, visitor_id, email, name, created_at, last_seen_at, total_sessions, total_bookings)
+    VALUES (
+        sqlc.arg(user_id),
+        sqlc.arg(visitor_id),
+        sqlc.narg(email),
+        sqlc.narg(name),
+        now(),
+        now(),
+        1,
+        CASE WHEN CAST(sqlc.arg(booking_made) AS boolean) THEN 1 ELSE 0 END
+    )
+    ON CONFLICT (visitor_id)
+    DO UPDATE SET
+      email = COALESCE(EXCLUDED.email, users.email),
+      name = COALESCE(EXCLUDED.name, users.name),
+      last_seen_at = now(),
+      total_sessions = users.total_sessions + 1,
+      total_bookings = users.total_bookings + EXCLUDED.total_bookings
+    RETURNING id
+),
+p AS (
+    INSERT INTO user_profiles (user_id, booked_before, last_visit_at, created_at)
+    SELECT id, sqlc.arg(booking_made), now(), now() FROM u
+    ON CONFLICT (user_id)
+    DO UPDATE SET
+      booked_before = user_profiles.booked_before OR EXCLUDED.booked_before,
+      last_visit_at = now()
+),
+s AS (
+    INSERT INTO sessions (
+        id, user_id, started_at, ended_at, duration_sec, booking_made,
+        analysis_status, analysis_version, r2_report_path, r2_audio_path,
+        analysis_attempts, last_analysis_at, error_message
+    )
+    SELECT
+        sqlc.arg(session_id), id, sqlc.arg(started_at), sqlc.narg(ended_at), sqlc.narg(duration_sec),
+        sqlc.arg(booking_made), 'pending', sqlc.arg(analysis_version), sqlc.narg(r2_report_path),
+        NULL, 0, NULL, NULL
+    FROM u
+),
+b AS (
+    INSERT INTO bookings (id, session_id, user_id, scheduled_time, timezone, status)
+    SELECT sqlc.arg(booking_id), sqlc.arg(session_id), id, sqlc.narg(scheduled_time), sqlc.narg(booking_timezone), 'scheduled'
+    FROM u
+    WHERE CAST(sqlc.narg(scheduled_time) AS timestamptz) IS NOT NULL
+)
+SELECT id FROM u;
+
+-- name: CaptureSessionByEmail :one
+WITH u AS (
+    INSERT INTO users (id, email, name, created_at, last_seen_at, total_sessions, total_bookings)
+    VALUES (
+        sqlc.arg(user_id),
+        sqlc.arg(email),
+        sqlc.narg(name),
+        now(),
+        now(),
+        1,
+        CASE WHEN CAST(sqlc.arg(booking_made) AS boolean) THEN 1 ELSE 0 END
+    )
+    ON CONFLICT (email)
+    DO UPDATE SET
+      name = COALESCE(EXCLUDED.name, users.name),
+      last_seen_at = now(),
+      total_sessions = users.total_sessions + 1,
+      total_bookings = users.total_bookings + EXCLUDED.total_bookings
+    RETURNING id
+),
+p AS (
+    INSERT INTO user_profiles (user_id, booked_before, last_visit_at, created_at)
+    SELECT id, sqlc.arg(booking_made), now(), now() FROM u
+    ON CONFLICT (user_id)
+    DO UPDATE SET
+      booked_before = user_profiles.booked_before OR EXCLUDED.booked_before,
+      last_visit_at = now()
+),
+s AS (
+    INSERT INTO sessions (
+        id, user_id, started_at, ended_at, duration_sec, booking_made,
+        analysis_status, analysis_version, r2_report_path, r2_audio_path,
+        analysis_attempts, last_analysis_at, error_message
+    )
+    SELECT
+        sqlc.arg(session_id), id, sqlc.arg(started_at), sqlc.narg(ended_at), sqlc.narg(duration_sec),
+        sqlc.arg(booking_made), 'pending', sqlc.arg(analysis_version), sqlc.narg(r2_report_path),
+        NULL, 0, NULL, NULL
+    FROM u
+),
+b AS (
+    INSERT INTO bookings (id, session_id, user_id, scheduled_time, timezone, status)
+    SELECT sqlc.arg(booking_id), sqlc.arg(session_id), id, sqlc.narg(scheduled_time), sqlc.narg(booking_timezone), 'scheduled'
+    FROM u
+    WHERE CAST(sqlc.narg(scheduled_time) AS timestamptz) IS NOT NULL
+)
+SELECT id FROM u;
@@ -42,8 +42,11 @@ CREATE TABLE sessions (
     created_at TIMESTAMPTZ NOT NULL DEFAULT now()
 );
 
-CREATE INDEX ix_sessions_user_id ON sessions (user_id);
-CREATE INDEX ix_sessions_user_id_analysis_status ON sessions (user_id, analysis_status);
+CREATE INDEX ix_sessions_user_id_started_at ON sessions (user_id, started_at DESC)
+    INCLUDE (booking_made, duration_sec);
+CREATE INDEX ix_sessions_user_id_analysis_status ON sessions (user_id, analysis_status)
+    WHERE analysis_status IN ('pending', 'in_progress', 'failed');
+CREATE INDEX ix_sessions_pending_created_at ON sessions (created_at) WHERE analysis_status = 'pending';
 
 CREATE TABLE bookings (
     id VARCHAR(32) PRIMARY KEY,
@@ -55,7 +58,7 @@ CREATE TABLE bookings (
     created_at TIMESTAMPTZ NOT NULL DEFAULT now()
 );
 
-CREATE INDEX ix_bookings_user_id ON bookings (user_id);
+CREATE INDEX ix_bookings_user_id_scheduled_time ON bookings (user_id, scheduled_time);
 CREATE INDEX ix_bookings_session_id ON bookings (session_id);
 
 CREATE TABLE analysis_results (
@@ -0,0 +1,1251 @@
+import asyncio
+import functools
+import logging
+import re
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from enum import IntFlag, auto
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from livekit.agents import Agent, function_tool, llm, RunContext, StopResponse
+
+from src.agents.prompts.v2 import GREETING_TEXT, STATIC_PREFIX
+from src.agents.tools.cal_com_booking import book_meeting as calcom_book_meeting
+from src.agents.tools.cal_com_booking import fetch_slots_by_date as calcom_fetch_slots_by_date
+from src.agents.tools.cal_com_booking import aformat_slots_summary
+from src.agents.tools.cal_com_booking import get_available_slots as calcom_get_available_slots
+
+logger = logging.getLogger(__name__)
+
+# Slot prefetch: started when booking begins, consumed by get_available_slots once
+# name/email are collected, so the Cal.com round trip is off the critical path.
+# Tests that mock the slot tools turn it off: the prefetch calls Cal.com directly.
+SLOT_PREFETCH_ENABLED = True
+SLOT_PREFETCH_DAYS = 14
+SLOT_PREFETCH_TTL_SEC = 120.0
+# Widest range get_available_slots will send to Cal.com.
+SLOT_QUERY_MAX_DAYS = 31
+# Grace period after the goodbye turn before the session is closed.
+SESSION_CLOSE_DELAY_SEC = 1.0
+
+
+class ConversationState:
+    GREETING = "GREETING"
+    DISCOVER_INTENT = "DISCOVER_INTENT"
+    VALUE_EXCHANGE = "VALUE_EXCHANGE"
+    OPTIONAL_DEPTH = "OPTIONAL_DEPTH"
+    SOFT_CTA = "SOFT_CTA"
+    BOOKING_COLLECT_NAME_AND_EMAIL = "BOOKING_COLLECT_NAME_AND_EMAIL"
+    BOOKING_TIME_RANGE = "BOOKING_TIME_RANGE"
+    BOOKING_PICK_SLOT = "BOOKING_PICK_SLOT"
+    BOOKING_CONFIRM_BOOKING = "BOOKING_CONFIRM_BOOKING"
+    WARM_CLOSE = "WARM_CLOSE"
+    RECOVERY = "RECOVERY"
+    END = "END"
+
+
+class IntentType:
+    UNKNOWN = "UNKNOWN"
+    EXPLORER = "EXPLORER"
+    HIRING = "HIRING"
+    FOUNDER = "FOUNDER"
+
+
+# Booking substates are sticky: routing leaves them alone until booking completes or the user ends.
+_BOOKING_STATES = frozenset(
+    {
+        ConversationState.BOOKING_COLLECT_NAME_AND_EMAIL,
+        ConversationState.BOOKING_TIME_RANGE,
+        ConversationState.BOOKING_PICK_SLOT,
+        ConversationState.BOOKING_CONFIRM_BOOKING,
+    }
+)
+# Slots have been offered: a booking request here picks a slot, it does not restart the flow.
+_SLOT_CHOICE_STATES = frozenset(
+    {ConversationState.BOOKING_PICK_SLOT, ConversationState.BOOKING_CONFIRM_BOOKING}
+)
+_OPENING_STATES = frozenset({ConversationState.GREETING, ConversationState.DISCOVER_INTENT})
+# States from which an interest signal may trigger the one-time soft CTA.
+_SOFT_CTA_STATES = frozenset(
+    {
+        ConversationState.DISCOVER_INTENT,
+        ConversationState.VALUE_EXCHANGE,
+        ConversationState.OPTIONAL_DEPTH,
+    }
+)
+
+
+def _text(msg: llm.ChatMessage | None) -> str:
+    """User text from the message; falls back to audio transcript when strings are not yet materialized."""
+    if not msg:
+        return ""
+    direct = (msg.text_content or "").strip()
+    if direct:
+        return direct
+    parts: list[str] = []
+    for c in getattr(msg, "content", None) or []:
+        if isinstance(c, str) and c.strip():
+            parts.append(c.strip())
+            continue
+        tr = getattr(c, "transcript", None)
+        if isinstance(tr, str) and tr.strip():
+            parts.append(tr.strip())
+    s = " ".join(parts).strip()
+    if s:
+        return s
+    ex = getattr(msg, "extra", None)
+    if isinstance(ex, dict):
+        for k in ("transcript", "user_transcript", "text"):
+            v = ex.get(k)
+            if isinstance(v, str) and v.strip():
+                return v.strip()
+    return ""
+
+
+def _user_text_for_turn(turn_ctx: llm.ChatContext, new_message: llm.ChatMessage | None) -> str:
+    """Best-effort user line for routing; also reads context if the new message is not fully materialized."""
+    t = _normalize_stt_text(_text(new_message)) if new_message else ""
+    if t:
+        return t
+    for it in reversed(turn_ctx.items):
+        if getattr(it, "type", None) == "message" and getattr(it, "role", None) == "user":
+            t2 = _normalize_stt_text(_text(it))  # type: ignore[arg-type]
+            if t2:
+                return t2
+    return ""
+
+
+def _normalize_stt_text(s: str) -> str:
+    """STT and clients may use curly apostrophes; normalize for reliable keyword and phrase checks."""
+    if not s:
+        return s
+    return s.replace("\u2019", "'").replace("\u2018", "'").replace("\u201c", '"').replace("\u201d", '"')
+
+
+# Keyword sets for per-turn routing, matched against the lowercased turn (see `_KEYWORD_RE`).
+_HIRING_KEYWORDS = ("hiring", "interview", "role", "position", "candidate", "recruit")
+_FOUNDER_KEYWORDS = (
+    "startup",
+    "founder",
+    "cofounder",
+    "cto",
+    "fundraising",
+    "seed",
+    "series",
+    "building",
+    "product",
+    "users",
+    "customers",
+)
+_DEPTH_KEYWORDS = (
+    "details",
+    "go deeper",
+    "deep dive",
+    "tell me more",
+    "how does",
+    "walk me through",
+    "architecture",
+    "design",
+    "why",
+    "approach",
+    "thinking",
+    "decision",
+    "tradeoff",
+    "trade-off",
+)
+_CONFUSION_KEYWORDS = (
+    "don't understand",
+    "do not understand",
+    "confused",
+    "what are you saying",
+    "what do you mean",
+    "not sure what you",
+    "doesn't make sense",
+    "does not make sense",
+)
+_END_KEYWORDS = (
+    "bye",
+    "goodbye",
+    "good bye",
+    "end the call",
+    "end this call",
+    "end call",
+    "hang up",
+    "that's all",
+    "that is all",
+    "we are done",
+    "we're done",
+)
+_BOOKING_KEYWORDS = (
+    "book",
+    "booked",
+    "booking",
+    "schedule",
+    "scheduled",
+    "scheduling",
+    "set up a call",
+    "calendly",
+    "calendar",
+    "meeting",
+    "meetings",
+)
+# Strong one- or two-word intent signals (see `_classify_intent_short`).
+_SHORT_HIRING_KEYWORDS = ("hiring", "hire", "interview", "recruit", "recruiter", "candidate")
+_SHORT_FOUNDER_KEYWORDS = ("founder", "startup", "cofounder", "cto", "seed", "series")
+_HIGH_INTENT_PHRASES = (
+    "need someone",
+    "this is interesting",
+    "sounds like",
+    "sounds good",
+    "can he",
+    "would he",
+    "work together",
+)
+_HIRE_WORD_RE = re.compile(r"\bhire\b")
+_FIT_WORD_RE = re.compile(r"\bfit\b")
+_CONCRETE_ROLE_KEYWORDS = (
+    "backend",
+    "systems",
+    "engineer",
+    "infrastructure",
+    "infra",
+    "devops",
+    "sre",
+    "full stack",
+    "fullstack",
+    "staff",
+)
+
+
+class _Kw(IntFlag):
+    """Keyword categories present in a user turn."""
+
+    HIRING = auto()
+    FOUNDER = auto()
+    DEPTH = auto()
+    CONFUSION = auto()
+    END = auto()
+    BOOKING = auto()
+
+
+# Categories that change state outright match whole words only ("facebook" is not a booking
+# request, "byelaw" is not a goodbye); the others keep substring semantics.
+_WORD_BOUNDED_KW = _Kw.END | _Kw.BOOKING
+
+
+def _keyword_group(kw: _Kw, words: tuple[str, ...]) -> str:
+    alternation = "|".join(map(re.escape, words))
+    if kw in _WORD_BOUNDED_KW:
+        alternation = rf"\b(?:{alternation})\b"
+    return f"(?=.*?(?P<{kw.name}>{alternation}))?"
+
+
+# All keyword sets in one compiled pattern: an optional lookahead per category, so a single
+# match() at position 0 reports every category present.
+_KEYWORD_RE = re.compile(
+    "".join(
+        _keyword_group(kw, words)
+        for kw, words in (
+            (_Kw.HIRING, _HIRING_KEYWORDS),
+            (_Kw.FOUNDER, _FOUNDER_KEYWORDS),
+            (_Kw.DEPTH, _DEPTH_KEYWORDS),
+            (_Kw.CONFUSION, _CONFUSION_KEYWORDS),
+            (_Kw.END, _END_KEYWORDS),
+            (_Kw.BOOKING, _BOOKING_KEYWORDS),
+        )
+    ),
+    re.DOTALL,
+)
+
+
+def _scan_keywords(user_text: str) -> _Kw:
+    return _scan_keywords_lc((user_text or "").lower())
+
+
+def _scan_keywords_lc(tl: str) -> _Kw:
+    """Classify an already-lowercased user turn against every keyword set in one regex call."""
+    m = _KEYWORD_RE.match(tl)
+    hits = _Kw(0)
+    for name, found in m.groupdict().items():  # type: ignore[union-attr]  # always matches
+        if found is not None:
+            hits |= _Kw[name]
+    return hits
+
+
+def _intent_from_keywords(kw: _Kw) -> str:
+    if _Kw.HIRING in kw:
+        return IntentType.HIRING
+    if _Kw.FOUNDER in kw:
+        return IntentType.FOUNDER
+    return IntentType.EXPLORER
+
+
+def _classify_intent(user_text: str) -> str:
+    return _intent_from_keywords(_scan_keywords(user_text))
+
+
+def _is_depth_request(user_text: str) -> bool:
+    return _Kw.DEPTH in _scan_keywords(user_text)
+
+
+def _expresses_confusion(user_text: str) -> bool:
+    return _Kw.CONFUSION in _scan_keywords(user_text)
+
+
+def _is_high_intent(user_text: str) -> bool:
+    return _is_high_intent_lc(user_text.lower())
+
+
+def _is_high_intent_lc(t: str) -> bool:
+    """Signals interest or next-step fit — not the same as stating 'we are hiring' (use \\b for hire)."""
+    if _HIRE_WORD_RE.search(t):
+        return True
+    if any(k in t for k in _HIGH_INTENT_PHRASES):
+        return True
+    return bool(_FIT_WORD_RE.search(t))
+
+
+def _is_short_filler_utterance(user_text: str, kw: _Kw | None = None) -> bool:
+    """Very short or backchannel phrasing: steer to RECOVERY instead of default VALUE."""
+    return _is_short_filler_utterance_lc((user_text or "").lower(), kw)
+
+
+def _is_short_filler_utterance_lc(tl: str, kw: _Kw | None = None) -> bool:
+    tl = tl.strip()
+    if not tl or len(tl.split()) > 2:
+        return False
+    if kw is None:
+        kw = _scan_keywords_lc(tl)
+    if kw & (_Kw.END | _Kw.BOOKING | _Kw.DEPTH) or _is_high_intent_lc(tl):
+        return False
+    if _classify_intent_short(tl) is not None:
+        return False
+    return True
+
+
+def _classify_intent_short(t: str) -> str | None:
+    """Strong 1-2 word signals so hiring/founder can be detected without turn-count gating."""
+    if any(k in t for k in _SHORT_HIRING_KEYWORDS):
+        return IntentType.HIRING
+    if any(k in t for k in _SHORT_FOUNDER_KEYWORDS):
+        return IntentType.FOUNDER
+    return None
+
+
+def _wants_end(user_text: str) -> bool:
+    return _Kw.END in _scan_keywords(user_text)
+
+
+def _wants_booking(user_text: str) -> bool:
+    return _Kw.BOOKING in _scan_keywords(user_text)
+
+
+# A reply to offered slots that names a time or points at one of them ("2 PM", "the first one").
+_SLOT_PICK_RE = re.compile(
+    r"\d|\b(?:am|pm|noon|first|second|third|last|earlier|later|that one|works|sounds good"
+    r"|yes|yeah|sure|ok|okay|perfect|great)\b"
+)
+
+
+def _is_slot_pick_lc(tl: str) -> bool:
+    return _SLOT_PICK_RE.search(tl) is not None
+
+
+# Local email check for set_email: catches garbled addresses before they reach Cal.com.
+_EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+
+
+# Clearly off-topic advice requests: first-person advice phrasing only, so questions about
+# Mihir's work ("how does he diagnose incidents?") never match. Compiled once; one pass,
+# the named group is the category.
+_OFF_TOPIC_RE = re.compile(
+    r"\b(?:"
+    r"(?P<medical>should i (?:take|stop taking) (?:\w+ ){0,3}?(?:medications?|medicines?|pills?)"
+    r"|(?:diagnose|prescribe) me\b|(?:i have|i've got|i'm having) (?:\w+ ){0,2}?symptoms?)"
+    r"|(?P<legal>am i (?:legally )?liable|(?:can|should) i sue|(?:give|need) (?:me )?legal advice)"
+    r"|(?P<financial>(?:which|what) stocks? should i (?:buy|sell|invest in)"
+    r"|should i (?:buy|sell|invest in) (?:\w+ ){0,2}?(?:stocks?|shares)|stock tips?|investment advice)"
+    r")\b",
+    re.IGNORECASE,
+)
+
+_OFF_TOPIC_REPLIES = {
+    "medical": (
+        "I can't help with medical questions, I'm only here to talk about Mihir's work. "
+        "Happy to share what he builds if that's useful."
+    ),
+    "legal": (
+        "I can't give legal advice, I'm only here to talk about Mihir's work. "
+        "Happy to share what he builds if that's useful."
+    ),
+    "financial": (
+        "I can't give investment advice, I'm only here to talk about Mihir's work. "
+        "Happy to share what he builds if that's useful."
+    ),
+}
+
+
+def _classify_off_topic(user_text: str) -> str | None:
+    """Return the off-topic category for a redirect without an LLM turn, or None."""
+    m = _OFF_TOPIC_RE.search(user_text or "")
+    return m.lastgroup if m else None
+
+
+def _build_memory_context(userdata: "BookingUserData") -> str | None:
+    """Layer 3: optional, soft memory context (kept intentionally non-creepy).
+
+    The inputs rarely change within a session, so the rendered block is cached on `userdata`.
+    """
+    sig = (
+        userdata.memory_hint,
+        userdata.intent_type,
+        userdata.booked_before,
+        userdata.company,
+        userdata.domain,
+    )
+    cached = userdata._memory_cache
+    if cached is not None and cached[0] == sig:
+        return cached[1]
+    mem = _render_memory_context(userdata)
+    userdata._memory_cache = (sig, mem)
+    return mem
+
+
+def _render_memory_context(userdata: "BookingUserData") -> str | None:
+    # Primary source: precomputed memory_hint, typically hydrated from long-term profile memory.
+    if userdata.memory_hint:
+        hint = userdata.memory_hint.strip()
+        if hint:
+            return (
+                "Memory context (use lightly, with uncertainty hedges; never quote verbatim). "
+                "Use this to shape tone and what you emphasize, not as a script.\n"
+                f"- {hint}"
+            )
+
+    # Fallback: derive a very small amount of context from session-level fields.
+    bits: list[str] = []
+
+    # Intent: helpful for framing questions, but keep it soft.
+    if userdata.intent_type != IntentType.UNKNOWN:
+        bits.append(
+            "From earlier in the conversation, they seem to be this intent type "
+            f"(not certain): {userdata.intent_type}."
+        )
+
+    # Booking history: only a light nudge, never pressure.
+    if userdata.booked_before:
+        bits.append(
+            "It looks like they may have booked a call with Mihir before. "
+            "If you mention this, hedge with phrases like 'if I remember right' "
+            "and do not be intense or salesy about it."
+        )
+
+    # Company/domain are high-value but optional; use only if present.
+    company = userdata.company
+    domain = userdata.domain
+    if company or domain:
+        detail_parts: list[str] = []
+        if company:
+            detail_parts.append(f"company: {company}")
+        if domain:
+            detail_parts.append(f"domain or area: {domain}")
+        bits.append(
+            "They have previously shared a bit about their background; "
+            + ", ".join(detail_parts)
+            + ". Use this only when directly relevant, and never quote past turns verbatim."
+        )
+
+    if not bits:
+        return None
+
+    return (
+        "Memory context (use lightly, with uncertainty hedges; never quote verbatim). "
+        "Use this to shape tone and what you emphasize, not as a script.\n"
+        + "\n".join(f"- {b}" for b in bits)
+    )
+
+
+def _user_indicated_concrete_role_or_stack(user_text: str) -> bool:
+    """True when the user has likely said enough for a direct founder reply without clarifying Q."""
+    t = (user_text or "").lower()
+    if len(t.split()) < 4:
+        return False
+    return any(k in t for k in _CONCRETE_ROLE_KEYWORDS)
+
+
+# Voice output contract repeated at the top of every Layer 2 instruction.
+_VOICE_CONTRACT = (
+    "HIGHEST PRIORITY FOR THIS TURN: If anything below conflicts with the general system persona, "
+    "follow this block for this turn only.\n\n"
+    "Voice output contract:\n"
+    "- plain text only\n"
+    "- 1 to 3 sentences by default\n"
+    "- at most 1 question\n"
+    "- calm, not salesy\n"
+    "- no lists, markdown, emojis, or code\n"
+)
+
+
+def _render_discover_intent(state: str, intent: str, concrete_role: bool) -> str:
+    if intent == IntentType.FOUNDER:
+        return (
+            f"You are in state: {state}. Intent: {intent}.\n"
+            f"{_VOICE_CONTRACT}\n"
+            "Goal: They are a founder evaluating an engineer. Mihir is not a co-founder. "
+            "Respond directly to what they are looking for or building first, then briefly "
+            "connect Mihir's experience to that context. Do not force a generic introduction "
+            "before addressing their need. Only ask what they're building or what problem "
+            "they're solving if they have not yet indicated a role, stack, or problem area. "
+            "CRITICAL: Do NOT ask for their name, email, or contact information. Do NOT call "
+            "set_profile, set_name, set_email, or any booking tools. Do NOT offer to schedule a call yet. "
+            "Stay focused on fit and substance."
+        )
+    return (
+        f"You are in state: {state}. Intent guess: {intent}.\n"
+        f"{_VOICE_CONTRACT}\n"
+        "Goal for this turn: warmly discover why they're here. Ask one simple question if needed."
+    )
+
+
+def _render_value_exchange(state: str, intent: str, concrete_role: bool) -> str:
+    if intent == IntentType.FOUNDER:
+        if concrete_role:
+            return (
+                f"You are in state: {state}. Intent: {intent}.\n"
+                f"{_VOICE_CONTRACT}\n"
+                "NON-NEGOTIABLE: You are Melvin. For Mihir's work use third person only (Mihir has, he builds) — never "
+                "'I have built' or 'I've worked' for his career; those imply you are Mihir. Do not end with a question. In two to three very short "
+                "sentences: acknowledge what they need or are building, then name how Mihir fits (backend/ "
+                "systems, Go or Python, ownership, shipping). No generic filler. "
+                "CRITICAL: No name, email, contact, or booking tools. No scheduling offer unless they "
+                "explicitly asked to book or meet."
+            )
+        return (
+            f"You are in state: {state}. Intent: {intent}.\n"
+            f"{_VOICE_CONTRACT}\n"
+            "NON-NEGOTIABLE: The first sentence MUST begin with the word 'Mihir' and state plainly that he is "
+            "a hands-on engineer (backend/systems) or how he works; then you may add one specific question about "
+            "what they are building or what 'technical help' means. Do not use 'I'd love' or a mirror-only opener. "
+            "CRITICAL: No name, email, contact, or booking tools. No meeting offer unless they ask."
+        )
+    return (
+        f"You are in state: {state}. Intent: {intent}.\n"
+        f"{_VOICE_CONTRACT}\n"
+        "Goal for this turn: answer what was asked directly and concisely. "
+        "Do NOT end with a question. Do NOT ask 'what else would you like to know?' or similar. "
+        "Let the user steer. Respond, then wait."
+    )
+
+
+def _render_optional_depth(state: str, intent: str, concrete_role: bool) -> str:
+    return (
+        f"You are in state: {state}. Intent: {intent}.\n"
+        f"{_VOICE_CONTRACT}\n"
+        "Goal for this turn: go deeper only on what they asked, avoid info-dumping, then check if that helps."
+    )
+
+
+def _render_soft_cta(state: str, intent: str, concrete_role: bool) -> str:
+    return (
+        f"You are in state: {state}. Intent: {intent}.\n"
+        f"{_VOICE_CONTRACT}\n"
+        "This state OVERRIDES any generic instruction to collect name and email. You are NOT in the "
+        "booking collection step. FORBIDDEN in this state: any tool calls (set_profile, set_name, set_email, "
+        "get_available_slots, book_meeting, get_current_datetime). If they want to book formally, they should say book or schedule. "
+        "Goal: mention a short call with Mihir as a possible next step, once, in a light way. "
+        "Spoken only — do not collect PII, do not call any tools, do not ask for contact details, "
+        "do not use phrasing that leads to name or email. "
+        "Example: 'If you want to go deeper, a short call with Mihir is an option — just say the word.'"
+    )
+
+
+def _render_booking_collect_name_and_email(state: str, intent: str, concrete_role: bool) -> str:
+    return (
+        f"You are in booking state: {state}. You do not have the user's name and email stored yet.\n"
+        f"{_VOICE_CONTRACT}\n"
+        "CRITICAL: Do NOT call get_available_slots, book_meeting, or get_current_datetime in this turn. "
+        "CRITICAL: Do NOT infer, guess, or make up names or emails. Only call set_profile (with both "
+        "name and email) if the user's message explicitly contains both their full name AND email address. "
+        "If the user has NOT provided both name and email in this message, do not call ANY tools; "
+        "reply once and explain that names and addresses are hard to get right by voice alone, so they "
+        "should TYPE their full name and email in the text or chat field (not only say them out loud). "
+        "Ask them to put both on one or two lines so nothing is garbled. "
+        "You must collect name and email BEFORE showing available slots. "
+        "Always ask for BOTH name and email together in a single request."
+    )
+
+
+def _render_booking_time_range(state: str, intent: str, concrete_role: bool) -> str:
+    return (
+        f"You are in booking state: {state}.\n"
+        f"{_VOICE_CONTRACT}\n"
+        "CRITICAL: Do NOT call get_available_slots or book_meeting in this turn. "
+        "Your only job is to ask the user for a date range (or a couple days) and their timezone. "
+        "Example: 'When would you like to meet? Do you have a date range in mind?' "
+        "Wait for the user to provide a date range before calling get_available_slots."
+    )
+
+
+def _render_booking_pick_slot(state: str, intent: str, concrete_role: bool) -> str:
+    return (
+        f"You are in booking state: {state}.\n"
+        f"{_VOICE_CONTRACT}\n"
+        "Goal for this turn: the user wants other days than the slots already offered. Call propose_slots "
+        "or get_available_slots for the new range, then offer a few options simply."
+    )
+
+
+def _render_booking_confirm_booking(state: str, intent: str, concrete_role: bool) -> str:
+    return (
+        f"You are in booking state: {state}.\n"
+        f"{_VOICE_CONTRACT}\n"
+        "Goal for this turn: if the user has picked a concrete date and time from the offered slots and you "
+        "have their name and email, restate date/time/timezone in one sentence and call book_meeting in this "
+        "same turn. Only ask a confirmation question if the slot or timezone is ambiguous. If they want "
+        "different days instead, fetch slots for those and offer a few options."
+    )
+
+
+def _render_warm_close(state: str, intent: str, concrete_role: bool) -> str:
+    return (
+        f"You are in state: {state}.\n"
+        f"{_VOICE_CONTRACT}\n"
+        "Goal for this turn: a clear closing — thank them, wish them well, or say a short line like you’re glad "
+        "they stopped by. Add a light closing line (e.g. take care, all the best, looking forward to the call if "
+        "relevant). Do not start new topics or push booking. Keep it 1-3 short sentences, calm and human."
+    )
+
+
+def _render_recovery(state: str, intent: str, concrete_role: bool) -> str:
+    return (
+        f"You are in state: {state}.\n"
+        f"{_VOICE_CONTRACT}\n"
+        "NON-NEGOTIABLE: The first four words of your reply MUST be exactly: 'Sorry if that was confusing' "
+        "unless the user turn was empty or silent, in which case start with: 'I'm still here' then continue. "
+        "After that, one plain sentence: Mihir is a hands-on backend and systems engineer, and you help explain his work. "
+        "End with one concrete next option the listener can take — a topic, project, or kind of role fit. "
+        "Do not skip the required opener above."
+    )
+
+
+def _render_end(state: str, intent: str, concrete_role: bool) -> str:
+    return (
+        f"You are in state: {state}.\n"
+        f"{_VOICE_CONTRACT}\n"
+        "Goal for this turn: a final goodbye — short, warm, and conclusive. Thank them, say goodbye, or wish them a "
+        "good day. Do not introduce new topics, questions, or booking. One to three brief sentences is enough."
+    )
+
+
+def _render_default(state: str, intent: str, concrete_role: bool) -> str:
+    return (
+        f"You are in state: {state}. Intent: {intent}.\n"
+        f"{_VOICE_CONTRACT}\n"
+        "Goal for this turn: keep it helpful, brief, and move the conversation forward."
+    )
+
+
+_STATE_RENDERERS: dict[str, Callable[[str, str, bool], str]] = {
+    ConversationState.DISCOVER_INTENT: _render_discover_intent,
+    ConversationState.VALUE_EXCHANGE: _render_value_exchange,
+    ConversationState.OPTIONAL_DEPTH: _render_optional_depth,
+    ConversationState.SOFT_CTA: _render_soft_cta,
+    ConversationState.BOOKING_COLLECT_NAME_AND_EMAIL: _render_booking_collect_name_and_email,
+    ConversationState.BOOKING_TIME_RANGE: _render_booking_time_range,
+    ConversationState.BOOKING_PICK_SLOT: _render_booking_pick_slot,
+    ConversationState.BOOKING_CONFIRM_BOOKING: _render_booking_confirm_booking,
+    ConversationState.WARM_CLOSE: _render_warm_close,
+    ConversationState.RECOVERY: _render_recovery,
+    ConversationState.END: _render_end,
+}
+
+
+def _render_state_instruction(state: str, intent: str, concrete_role: bool) -> str:
+    """Render the Layer 2 instruction for one (state, intent) pair.
+
+    `concrete_role` only matters for founders in VALUE_EXCHANGE: whether the user already named a
+    role, stack, or problem area (see `_user_indicated_concrete_role_or_stack`).
+    """
+    return _STATE_RENDERERS.get(state, _render_default)(state, intent, concrete_role)
+
+
+def _public_values(namespace: type) -> list[str]:
+    return [v for k, v in vars(namespace).items() if not k.startswith("_")]
+
+
+# Every (state, intent, concrete_role) combination rendered once at import; per-turn work is a lookup.
+_STATE_INSTRUCTIONS: dict[tuple[str, str, bool], str] = {
+    (state, intent, concrete_role): _render_state_instruction(state, intent, concrete_role)
+    for state in _public_values(ConversationState)
+    for intent in _public_values(IntentType)
+    for concrete_role in (False, True)
+}
+
+
+def _build_state_instruction(userdata: "BookingUserData", last_user_text: str = "") -> str:
+    """Layer 2: per-turn instruction based on the current state."""
+    state = userdata.state or ConversationState.DISCOVER_INTENT
+    intent = userdata.intent_type or IntentType.UNKNOWN
+    concrete_role = (
+        state == ConversationState.VALUE_EXCHANGE
+        and intent == IntentType.FOUNDER
+        and _user_indicated_concrete_role_or_stack(last_user_text)
+    )
+    cached = _STATE_INSTRUCTIONS.get((state, intent, concrete_role))
+    if cached is None:
+        return _render_state_instruction(state, intent, concrete_role)
+    return cached
+
+
+def _build_turn_instruction(userdata: "BookingUserData", last_user_text: str = "") -> str:
+    """Layer 2 state instruction with the Layer 3 memory context appended, as one message."""
+    instruction = _build_state_instruction(userdata, last_user_text)
+    mem = _build_memory_context(userdata)
+    if mem:
+        return f"{instruction}\n\n{mem}"
+    return instruction
+
+
+# Queued after a failed booking so the following turn does not retry it.
+_BOOKING_FAILED_NOTE = (
+    "Note: the last booking attempt failed. Do not call book_meeting again unless the user asks; "
+    "offer to follow up over email instead."
+)
+
+
+def _add_developer_message(
+    turn_ctx: llm.ChatContext, userdata: "BookingUserData", instruction: str
+) -> None:
+    """Append the turn instruction and drain any queued notes as a single developer message."""
+    notes = userdata.pending_dev_notes
+    if notes:
+        instruction = "\n\n".join([instruction, *notes])
+        notes.clear()
+    turn_ctx.add_message(role="developer", content=instruction)
+
+
+@functools.lru_cache(maxsize=64)
+def _zone(name: str) -> ZoneInfo:
+    """IANA zone for a tool argument, falling back to UTC for unknown names (cached, incl. misses)."""
+    try:
+        return ZoneInfo(name)
+    except Exception:
+        return ZoneInfo("UTC")
+
+
+def _slot_range_error(start_date: str, end_date: str) -> str | None:
+    """Guidance for the model when a slot range is malformed, inverted, or too wide; None if usable."""
+    try:
+        start = date.fromisoformat(start_date.strip())
+        end = date.fromisoformat(end_date.strip())
+    except ValueError:
+        return "Invalid date format: start_date and end_date must be YYYY-MM-DD. Call get_available_slots again."
+    if end < start:
+        return "end_date must be on or after start_date; re-check the range with the user before calling again."
+    if (end - start).days >= SLOT_QUERY_MAX_DAYS:
+        return (
+            f"That range is too wide; ask the user to narrow it to at most {SLOT_QUERY_MAX_DAYS} days "
+            "(a week or a couple of days works best)."
+        )
+    return None
+
+
+def _resolve_slot_window(relative_window: str, today: date) -> tuple[str, str] | None:
+    """Inclusive (start_date, end_date) for a propose_slots window, or None if unrecognised.
+
+    Weeks run Monday to Sunday; "this_week" starts today.
+    """
+    key = relative_window.strip().lower().replace(" ", "_")
+    if key == "today":
+        start = end = today
+    elif key == "tomorrow":
+        start = end = today + timedelta(days=1)
+    elif key == "this_week":
+        start, end = today, today + timedelta(days=6 - today.weekday())
+    elif key == "next_week":
+        start = today + timedelta(days=7 - today.weekday())
+        end = start + timedelta(days=6)
+    else:
+        start_str, sep, end_str = relative_window.partition("..")
+        if not sep:
+            return None
+        return start_str.strip(), end_str.strip()
+    return start.isoformat(), end.isoformat()
+
+
+def _store_name(userdata: "BookingUserData", value: str) -> str:
+    """Shared by set_name and set_profile; returns the tool result."""
+    name = value.strip()
+    userdata.name = name
+    logger.info("set_name: value=%s", name)
+    return f"Got it, I have your name as {name}."
+
+
+def _store_email(userdata: "BookingUserData", value: str) -> str:
+    """Shared by set_email and set_profile; validates, stores, and advances the booking state."""
+    email = value.strip()
+    if not _EMAIL_RE.fullmatch(email):
+        result = (
+            f"The email {email!r} does not look valid. Ask the user to type their email "
+            "again in the text field; do not call book_meeting until set_email succeeds."
+        )
+        logger.info("set_email: invalid value=%s -> result=%s", value, result)
+        return result
+    userdata.email = email
+    if userdata.state == ConversationState.BOOKING_COLLECT_NAME_AND_EMAIL:
+        # Transition to TIME_RANGE so next turn asks for time range
+        userdata.state = ConversationState.BOOKING_TIME_RANGE
+    logger.info("set_email: value=%s", email)
+    return f"Got it, I have your email as {email}."
+
+
+_WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+
+@functools.lru_cache(maxsize=64)
+def _format_now(timezone: str, epoch_minute: int) -> str:
+    """get_current_datetime text for one wall-clock minute (zone offsets are whole minutes)."""
+    now = datetime.fromtimestamp(epoch_minute * 60, tz=_zone(timezone))
+    return (
+        f"Current date: {now.year:04d}-{now.month:02d}-{now.day:02d} ({_WEEKDAYS[now.weekday()]}). "
+        f"Current time: {now.hour:02d}:{now.minute:02d} {timezone}."
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class BookingDetails:
+    scheduled_time_utc_iso: str  # ISO UTC datetime of the meeting
+    timezone: str                # IANA timezone for the attendee
+
+
+@dataclass(slots=True)
+class BookingUserData:
+    """Stored profile for the current session (used when booking meetings)."""
+    name: str | None = None
+    email: str | None = None
+    # Optional profile-style memory captured within the session. These may be
+    # hydrated from / written back to long-term user profile storage.
+    company: str | None = None
+    domain: str | None = None
+    booked_before: bool = False
+    # Phase 3: explicit conversation state tracking
+    state: str = ConversationState.GREETING
+    intent_type: str = IntentType.UNKNOWN
+    booking_offer_count: int = 0
+    turn_count: int = 0
+    # Phase 3 hook point for Phase 1 memory. Keep this soft & optional.
+    memory_hint: str | None = None
+    # Populated on successful booking for DB persistence.
+    booking_details: BookingDetails | None = None
+    # Developer notes queued by tools; delivered with the next turn's Layer 2 + 3 message.
+    pending_dev_notes: list[str] = field(default_factory=list, repr=False, compare=False)
+    # Last rendered Layer 3 block and the inputs it was built from (see `_build_memory_context`).
+    _memory_cache: tuple[tuple, str | None] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+
+@dataclass(slots=True)
+class _SlotPrefetch:
+    """Per-session slot prefetch state, held by the agent as a single reference."""
+    task: asyncio.Task
+    window: tuple[str, str]  # inclusive (start_date, end_date), YYYY-MM-DD
+    started_at: float  # time.monotonic()
+
+    def is_fresh(self) -> bool:
+        return time.monotonic() - self.started_at < SLOT_PREFETCH_TTL_SEC
+
+
+class PortfolioAssistant(Agent):
+    """Melvin. One instance per session: LiveKit binds an Agent to a single activity, so
+    instances are never shared. Construction stays cheap because the instructions are the
+    module-level STATIC_PREFIX; per-session state lives on BookingUserData."""
+
+    def __init__(self) -> None:
+        # Keep instructions static; dynamic layers are appended per turn so the prefix stays cacheable.
+        super().__init__(instructions=STATIC_PREFIX)
+        self._end_requested: bool = False
+        self._close_handle: asyncio.TimerHandle | None = None
+        self._slot_prefetch: _SlotPrefetch | None = None
+
+    async def on_enter(self) -> None:
+        # Phase 3: move initial greeting into the agent lifecycle hook.
+        self.session.userdata.state = ConversationState.GREETING  # type: ignore[attr-defined]
+        # The greeting is fixed text: speak it directly instead of paying a full LLM round trip
+        # to reproduce it word for word. It is still added to the chat context.
+        await self.session.say(GREETING_TEXT)
+        self.session.userdata.state = ConversationState.DISCOVER_INTENT  # type: ignore[attr-defined]
+
+    async def on_user_turn_completed(
+        self, turn_ctx: llm.ChatContext, new_message: llm.ChatMessage
+    ) -> None:
+        # Phase 3: lightweight routing to update state/intent, then inject Layer 2 + Layer 3.
+        ud: BookingUserData = self.session.userdata  # type: ignore[assignment]
+        user_text = _user_text_for_turn(turn_ctx, new_message)
+        # Lowercase once per turn; the keyword helpers below all take the lowered text.
+        tl = user_text.lower()
+        kw = _scan_keywords_lc(tl)
+
+        if user_text and _Kw.END in kw:
+            ud.state = ConversationState.END
+            self._end_requested = True
+
+        ud.turn_count += 1
+
+        n_words = len(tl.split())
+        if n_words >= 3:
+            ud.intent_type = _intent_from_keywords(kw)
+        elif n_words:
+            short = _classify_intent_short(tl)
+            if short is not None:
+                ud.intent_type = short
+
+        # Do not change state once we've reached END.
+        if ud.state == ConversationState.END:
+            _add_developer_message(turn_ctx, ud, _build_turn_instruction(ud, user_text))
+            self._cancel_slot_prefetch()
+            # One timer per session, however many goodbyes follow.
+            if self._end_requested and self._close_handle is None:
+                self._close_handle = asyncio.get_running_loop().call_later(
+                    SESSION_CLOSE_DELAY_SEC, self._schedule_close
+                )
+            return
+
+        # Booking takes precedence when user explicitly requests it.
+        if _Kw.BOOKING in kw and ud.state not in _SLOT_CHOICE_STATES:
+            self._start_slot_prefetch()
+            if not ud.name or not ud.email:
+                ud.state = ConversationState.BOOKING_COLLECT_NAME_AND_EMAIL
+            elif ud.name and ud.email:
+                # Only transition to TIME_RANGE if we have both name and email
+                # This ensures we ask for time range in the NEXT turn after collecting email
+                ud.state = ConversationState.BOOKING_TIME_RANGE
+        else:
+            # Keep booking substates sticky unless the user clearly abandons.
+            if ud.state in _BOOKING_STATES:
+                # The only move is forward: a pick from the offered slots goes to confirm-and-book.
+                if ud.state == ConversationState.BOOKING_PICK_SLOT and (
+                    _Kw.BOOKING in kw or _is_slot_pick_lc(tl)
+                ):
+                    ud.state = ConversationState.BOOKING_CONFIRM_BOOKING
+            else:
+                # Guardrail: clearly off-topic advice gets a canned redirect, skipping the LLM
+                # turn. Anything that also reads as hiring or founder talk goes to the LLM.
+                if not kw & (_Kw.HIRING | _Kw.FOUNDER):
+                    off_topic = _classify_off_topic(user_text)
+                    if off_topic is not None:
+                        logger.info(
+                            "on_user_turn_completed: off-topic redirect category=%s", off_topic
+                        )
+                        self.session.say(_OFF_TOPIC_REPLIES[off_topic])
+                        raise StopResponse()
+
+                if not user_text:
+                    ud.state = ConversationState.RECOVERY
+                elif _Kw.CONFUSION in kw:
+                    ud.state = ConversationState.RECOVERY
+                elif _Kw.DEPTH in kw:
+                    ud.state = ConversationState.OPTIONAL_DEPTH
+                elif n_words <= 2 and _is_short_filler_utterance_lc(tl, kw):
+                    ud.state = ConversationState.RECOVERY
+                elif user_text and ud.intent_type == IntentType.HIRING:
+                    ud.state = ConversationState.VALUE_EXCHANGE
+                elif ud.state in _OPENING_STATES and ud.turn_count <= 1:
+                    ud.state = ConversationState.DISCOVER_INTENT
+                else:
+                    ud.state = ConversationState.VALUE_EXCHANGE
+
+                # Soft CTA: when the user shows clear interest or alignment, once — not time-based.
+                if (
+                    user_text
+                    and _is_high_intent_lc(tl)
+                    and ud.booking_offer_count < 1
+                    and ud.intent_type != IntentType.FOUNDER
+                    and ud.state in _SOFT_CTA_STATES
+                ):
+                    ud.state = ConversationState.SOFT_CTA
+                    ud.booking_offer_count += 1
+
+        if ud.state not in _BOOKING_STATES:
+            self._cancel_slot_prefetch()
+
+        # Layers 2 + 3 (plus any queued notes): one ephemeral developer message for this turn
+        _add_developer_message(turn_ctx, ud, _build_turn_instruction(ud, user_text))
+
+    def _start_slot_prefetch(self) -> None:
+        """Fetch a default window of slots in the background while name/email are collected."""
+        if not SLOT_PREFETCH_ENABLED:
+            return
+        if self._slot_prefetch is not None and self._slot_prefetch.is_fresh():
+            return
+        self._cancel_slot_prefetch()
+        today = datetime.now(_zone("UTC")).date()
+        window = (today.isoformat(), (today + timedelta(days=SLOT_PREFETCH_DAYS - 1)).isoformat())
+        task = asyncio.create_task(calcom_fetch_slots_by_date(*window))
+        # Consume failures (e.g. Cal.com not configured) if the prefetch is never used.
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._slot_prefetch = _SlotPrefetch(task=task, window=window, started_at=time.monotonic())
+
+    def _cancel_slot_prefetch(self) -> None:
+        if self._slot_prefetch is not None and not self._slot_prefetch.task.done():
+            self._slot_prefetch.task.cancel()
+        self._slot_prefetch = None
+
+    async def _prefetched_slots(self, start_date: str, end_date: str) -> dict[str, list[dict]] | None:
+        """Slots for [start_date, end_date] from the prefetch, or None if it cannot serve the range."""
+        prefetch = self._slot_prefetch
+        if prefetch is None or not prefetch.is_fresh():
+            return None
+        window = prefetch.window
+        try:
+            start = date.fromisoformat(start_date.strip()).isoformat()
+            end = date.fromisoformat(end_date.strip()).isoformat()
+        except ValueError:
+            return None
+        if not (window[0] <= start <= end <= window[1]):
+            return None
+        try:
+            slots_by_date = await prefetch.task
+        except Exception:
+            return None
+        if isinstance(slots_by_date, str):
+            # Error message: let a fresh request report it.
+            return None
+        return {d: slots for d, slots in slots_by_date.items() if start <= d <= end}
+
+    def _schedule_close(self) -> None:
+        asyncio.create_task(self._close_session())
+
+    async def _close_session(self) -> None:
+        try:
+            await self.session.aclose()
+        except Exception as e:
+            logger.warning("PortfolioAssistant: failed to close session: %s", e)
+
+    @function_tool(
+        name="get_current_datetime",
+        description="Get the current date and time. Call this when the user says things like 'tomorrow', 'next Monday', 'this week', or asks what day/time it is, so you can compute correct dates for booking.",
+    )
+    async def get_current_datetime(
+        self, context: RunContext[BookingUserData], timezone: str = "UTC"
+    ) -> str:
+        """Return the current date and time. Use when resolving relative dates like tomorrow or next Monday.
+        Args:
+            timezone: Optional IANA timezone (e.g. Asia/Kolkata, America/New_York) to show time in that zone.
+        """
+        result = _format_now(timezone, int(time.time() // 60))
+        logger.info("get_current_datetime: timezone=%s -> result=%s", timezone, result)
+        return result
+
+    @function_tool(
+        name="set_name",
+        description="Call this ONLY when the user has explicitly provided their full name in their text or message (ideally typed). Do NOT infer or guess names. Store it for the booking.",
+    )
+    async def set_name(self, context: RunContext[BookingUserData], value: str) -> str:
+        """Store the user's name. Call ONLY when the user gave their full name in what they wrote or said—prefer typed text for accuracy.
+        Args:
+            value: The full name the user provided. Do NOT infer or make up names.
+        """
+        return _store_name(context.userdata, value)
+
+    @function_tool(
+        name="set_email",
+        description="Call this ONLY when the user has explicitly provided their email in their text or message (ideally typed). Do NOT infer or guess emails. Store it for the booking.",
+    )
+    async def set_email(self, context: RunContext[BookingUserData], value: str) -> str:
+        """Store the user's email. Call ONLY when the user gave their email in what they wrote or said—prefer typed text.
+        Args:
+            value: The email the user provided. Do NOT infer or make up emails.
+        """
+        return _store_email(context.userdata, value)
+
+    @function_tool(
+        name="set_profile",
+        description="Call this when the user has explicitly provided BOTH their full name and email in one message (ideally typed). Stores both in one call; prefer it over set_name + set_email. Do NOT infer or guess either value.",
+    )
+    async def set_profile(
+        self,
+        context: RunContext[BookingUserData],
+        name: str | None = None,
+        email: str | None = None,
+    ) -> str:
+        """Store the user's name and email together. Call ONLY with values the user actually gave.
+        Args:
+            name: The full name the user provided. Do NOT infer or make up names.
+            email: The email the user provided. Do NOT infer or make up emails.
+        """
+        results = []
+        if name and name.strip():
+            results.append(_store_name(context.userdata, name))
+        if email and email.strip():
+            results.append(_store_email(context.userdata, email))
+        if not results:
+            return "Nothing stored: ask the user to type their full name and email."
+        return " ".join(results)
+
+    @function_tool()
+    async def get_available_slots(
+        self,
+        context: RunContext[BookingUserData],
+        start_date: str,
+        end_date: str,
+        timezone: str = "Asia/Kolkata",
+    ) -> str:
+        """Get available meeting slots from Cal.com for a date range. Only call this AFTER you have collected the user's name and email. Do not call this if you are in BOOKING_COLLECT_NAME_AND_EMAIL state. Call this when the user wants to book a meeting and you already have their name and email, so you can tell them which times are free before they choose.
+        Args:
+            start_date: Start of range in YYYY-MM-DD format (e.g. 2025-02-10).
+            end_date: End of range in YYYY-MM-DD format (e.g. 2025-02-16).
+            timezone: IANA timezone for the user (e.g. Asia/Kolkata for India). Use Asia/Kolkata if user is in India or timezone unknown.
+        """
+        return await self._available_slots("get_available_slots", start_date, end_date, timezone)
+
+    @function_tool(
+        name="propose_slots",
+        description="Get available meeting slots for today, tomorrow, this week or next week in one call, without calling get_current_datetime first. Only call this AFTER you have collected the user's name and email.",
+    )
+    async def propose_slots(
+        self,
+        context: RunContext[BookingUserData],
+        relative_window: str,
+        timezone: str = "Asia/Kolkata",
+    ) -> str:
+        """Get available meeting slots for a relative window; the dates are resolved in the user's timezone.
+        Args:
+            relative_window: One of today, tomorrow, this_week, next_week, or an explicit range YYYY-MM-DD..YYYY-MM-DD.
+            timezone: IANA timezone for the user (e.g. Asia/Kolkata for India). Use Asia/Kolkata if user is in India or timezone unknown.
+        """
+        today = datetime.now(_zone(timezone)).date()
+        window = _resolve_slot_window(relative_window, today)
+        if window is None:
+            result = (
+                "Unknown relative_window: use today, tomorrow, this_week, next_week or "
+                "YYYY-MM-DD..YYYY-MM-DD, or call get_available_slots with explicit dates."
+            )
+            logger.info("propose_slots: rejected relative_window=%s -> result=%s", relative_window, result)
+            return result
+        return await self._available_slots("propose_slots", *window, timezone)
+
+    async def _available_slots(
+        self, tool: str, start_date: str, end_date: str, timezone: str
+    ) -> str:
+        """Shared by get_available_slots and propose_slots; `tool` names the caller in logs."""
+        range_error = _slot_range_error(start_date, end_date)
+        if range_error is not None:
+            logger.info(
+                "%s: rejected start_date=%s end_date=%s -> result=%s",
+                tool,
+                start_date,
+                end_date,
+                range_error,
+            )
+            return range_error
+        try:
+            prefetched = await self._prefetched_slots(start_date, end_date)
+            if prefetched is not None:
+                result = await aformat_slots_summary(
+                    prefetched, start_date, end_date, timezone=timezone
+                )
+            else:
+                result = await calcom_get_available_slots(
+                    start_date=start_date,
+                    end_date=end_date,
+                    timezone=timezone,
+                )
+            logger.info(
+                "%s: start_date=%s end_date=%s timezone=%s -> result=%s",
+                tool,
+                start_date,
+                end_date,
+                timezone,
+                result,
+            )
+            # format_slots_summary lists times as "On <date> available times are: ...".
+            ud: BookingUserData = self.session.userdata  # type: ignore[assignment]
+            if result.startswith("On ") and ud.state in _BOOKING_STATES:
+                ud.state = ConversationState.BOOKING_PICK_SLOT
+            return result
+        except Exception as e:  # pragma: no cover - defensive, should be rare
+            # Phase 4: error-safe behavior. The tool should never crash the agent;
+            # instead, return guidance that leads to a calm, single apology and a fallback.
+            logger.warning("%s: cal.com error: %s", tool, e, exc_info=True)
+            return (
+                f"ERROR: {tool} failed due to a booking system or configuration issue. "
+                "When you respond to the user, briefly apologize once, explain that the booking "
+                "system is having trouble, and offer a simple fallback like suggesting a couple "
+                "of days and times they can mention, or letting them follow up over email instead."
+            )
+
+    @function_tool()
+    async def book_meeting(
+        self,
+        context: RunContext[BookingUserData],
+        attendee_name: str,
+        attendee_email: str,
+        date: str,
+        time_slot: str,
+        timezone: str = "Asia/Kolkata",
+        notes: str = "",
+    ) -> str:
+        """Book a meeting with the founder using Cal.com. Use this only after the user has chosen a date and time from the available slots you showed them. Use stored name and email from set_profile/set_name/set_email when the user already provided them; otherwise pass them here.
+        Args:
+            attendee_name: Full name of the person booking. Use stored name from session if already set.
+            attendee_email: Email for the booking confirmation. Use stored email from session if already set.
+            date: Date for the meeting in YYYY-MM-DD format (e.g. 2025-02-10).
+            time_slot: Time for the meeting (e.g. 14:00 or 2:00 PM). Must be one of the slots returned by get_available_slots.
+            timezone: IANA timezone for the attendee (e.g. America/New_York, Asia/Kolkata). Use UTC if not provided.
+            notes: Optional notes or reason for the meeting.
+        """
+        name = (attendee_name or "").strip() or (context.userdata.name or "")
+        email = (attendee_email or "").strip() or (context.userdata.email or "")
+        if not name or not email:
+            missing = []
+            if not name:
+                missing.append("name")
+            if not email:
+                missing.append("email")
+            result = f"Cannot book yet: please ask the user for their {', '.join(missing)} and call set_profile, set_name or set_email first."
+            logger.info("book_meeting: skipped (missing %s) -> result=%s", missing, result)
+            return result
+        try:
+            booking = await calcom_book_meeting(
+                attendee_name=name,
+                attendee_email=email,
+                date=date,
+                time_slot=time_slot,
+                timezone=timezone,
+                notes=notes or None,
+            )
+        except Exception as e:  # pragma: no cover - defensive, should be rare
+            # Phase 4: error-safe behavior for booking failures.
+            logger.warning("book_meeting: cal.com error: %s", e, exc_info=True)
+            return (
+                "ERROR: book_meeting failed due to a booking system or configuration issue. "
+                "When you respond to the user, apologize once, explain that the calendar system "
+                "is not responding correctly, and suggest a clear fallback such as sharing a "
+                "preferred time window or following up via email instead of booking live."
+            )
+
+        result = booking.message
+        if booking.ok:
+            context.userdata.booked_before = True
+            context.userdata.state = ConversationState.WARM_CLOSE
+            context.userdata.booking_details = BookingDetails(
+                scheduled_time_utc_iso=booking.start_utc_iso,
+                timezone=timezone,
+            )
+        else:
+            # Even when booking fails, do not loop endlessly in booking states.
+            # Let the assistant move toward a warm close or alternative suggestion.
+            context.userdata.state = ConversationState.WARM_CLOSE
+            context.userdata.pending_dev_notes.append(_BOOKING_FAILED_NOTE)
+
+        logger.info(
+            "book_meeting: attendee=%s date=%s time_slot=%s -> result=%s",
+            name,
+            date,
+            time_slot,
+            result,
+        )
+        return result
\ No newline at end of file
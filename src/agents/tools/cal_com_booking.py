@@ -1,7 +1,13 @@
 """Cal.com API client for voice bot meeting booking."""
 
+import asyncio
+import functools
+import json
 import logging
-from datetime import datetime
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
 import httpx
@@ -10,12 +16,104 @@ from src.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+_UTC = ZoneInfo("UTC")
+
+
+@functools.lru_cache(maxsize=256)
+def _tz(name: str) -> ZoneInfo:
+    """Cached ZoneInfo lookup; raises like ZoneInfo for unknown names (failures are not cached)."""
+    return ZoneInfo(name)
+
+
+# Load the zones most callers use at import so the first tool call of a session does not
+# read tzdata. ZoneInfo keeps these instances cached, so portfolio_agent._zone shares them.
+for _name in (
+    "UTC",
+    "Asia/Kolkata",
+    "America/New_York",
+    "America/Los_Angeles",
+    "Europe/London",
+    "Europe/Berlin",
+    "Australia/Sydney",
+):
+    _tz(_name)
+del _name
+
+
 # Cal.com slots API version header (required for GET /slots)
 CALCOM_SLOTS_API_VERSION = "2024-09-04"
 
+# Successful slot lookups are reused briefly: a session re-asks for the same window and
+# concurrent sessions overlap. Errors are never cached; a booking drops the windows covering its day.
+SLOTS_CACHE_TTL_SEC = 45.0
+SLOTS_CACHE_MAXSIZE = 256
+
+_client: httpx.AsyncClient | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Shared client so Cal.com calls reuse pooled keep-alive connections instead of a new TLS handshake."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=15.0,
+            limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+            # Slot lookups use the client's default api version; bookings override it.
+            headers={
+                "Authorization": f"Bearer {settings.CALCOM_API_KEY}",
+                "cal-api-version": settings.CALCOM_API_VERSION,
+            },
+        )
+    return _client
+
+
+@functools.cache
+def _booking_headers() -> dict[str, str]:
+    """Per-request headers for POST /bookings, built once (settings are read on first use)."""
+    return {
+        "cal-api-version": settings.CALCOM_BOOKING_API_VERSION,
+        # The body is pre-encoded and sent as content=, so httpx does not set this itself
+        "Content-Type": "application/json",
+    }
+
+
+@functools.cache
+def _event_type_id() -> int:
+    """CALCOM_EVENT_TYPE_ID as an int, parsed once (settings are frozen)."""
+    return int(settings.CALCOM_EVENT_TYPE_ID)
+
+
+async def aclose_client() -> None:
+    """Close the shared client; the next Cal.com call opens a fresh one."""
+    global _client
+    if _client is not None:
+        client, _client = _client, None
+        await client.aclose()
+
+
+_slots_cache: OrderedDict[tuple[str, str], tuple[float, dict[str, list[dict]]]] = OrderedDict()
+
+
+def _invalidate_slots_for_day(day: str) -> None:
+    """Drop cached windows that include `day` (YYYY-MM-DD, UTC like the /slots range)."""
+    for key in [k for k in _slots_cache if k[0] <= day <= k[1]]:
+        del _slots_cache[key]
+
+
+@dataclass(frozen=True, slots=True)
+class BookingResult:
+    """Outcome of a booking attempt; `message` is what the agent reads back to the model."""
+    ok: bool
+    message: str
+    start_utc_iso: str | None = None  # booked start, set on success
+
+
+# Settings are frozen, so whether Cal.com is configured is fixed at import.
+_CALCOM_CONFIGURED = bool(settings.CALCOM_API_KEY and settings.CALCOM_EVENT_TYPE_ID)
+
 
 def _require_calcom_config() -> None:
-    if not settings.CALCOM_API_KEY or not settings.CALCOM_EVENT_TYPE_ID:
+    if not _CALCOM_CONFIGURED:
         raise ValueError(
             "Cal.com is not configured. Set CALCOM_API_KEY and CALCOM_EVENT_TYPE_ID in your environment."
         )
@@ -32,6 +130,16 @@ def _parse_time(time_str: str) -> tuple[int, int]:
     return t.hour, t.minute
 
 
+@functools.lru_cache(maxsize=256)
+def _fixed_utc_offset(timezone_str: str, date_str: str) -> timedelta | None:
+    """UTC offset of `timezone_str` on `date_str` (YYYY-MM-DD), or None if it changes that day (DST)."""
+    tz = _tz(timezone_str)
+    day = datetime.strptime(date_str, "%Y-%m-%d")
+    start = day.replace(tzinfo=tz).utcoffset()
+    end = day.replace(hour=23, minute=59, tzinfo=tz).utcoffset()
+    return start if start == end else None
+
+
 def _build_start_utc_iso(date_str: str, time_str: str, timezone_str: str) -> str:
     """Build start datetime in the given timezone and return as UTC ISO string (e.g. 2024-08-13T09:00:00Z)."""
     date_str = date_str.strip()
@@ -41,59 +149,100 @@ def _build_start_utc_iso(date_str: str, time_str: str, timezone_str: str) -> str
         raise ValueError(f"Date must be YYYY-MM-DD, got: {date_str}")
     hour, minute = _parse_time(time_str)
     local_dt = base_date.replace(hour=hour, minute=minute, second=0, microsecond=0)
-    tz = ZoneInfo(timezone_str)
-    utc_dt = local_dt.replace(tzinfo=tz).astimezone(ZoneInfo("UTC"))
-    return utc_dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+    if timezone_str == "UTC":
+        # No conversion needed: the local components already are the UTC ones
+        return (
+            f"{local_dt.year:04d}-{local_dt.month:02d}-{local_dt.day:02d}"
+            f"T{hour:02d}:{minute:02d}:00Z"
+        )
+    offset = _fixed_utc_offset(timezone_str, date_str)
+    if offset is not None:
+        utc_dt = local_dt - offset
+    else:
+        utc_dt = local_dt.replace(tzinfo=_tz(timezone_str)).astimezone(_UTC)
+    return (
+        f"{utc_dt.year:04d}-{utc_dt.month:02d}-{utc_dt.day:02d}"
+        f"T{utc_dt.hour:02d}:{utc_dt.minute:02d}:{utc_dt.second:02d}Z"
+    )
 
 
-def _format_slot_time(iso_start: str, timezone: str = "Asia/Kolkata") -> str:
-    """Format ISO start time for voice in the given timezone (e.g. 09:00 -> 9:00 AM).
-    Cal.com returns slots in UTC; we convert to the user's timezone for display.
+def _parse_slot_start(iso_start: str) -> datetime:
+    """Parse a slot start as an aware UTC datetime.
+
+    Cal.com returns UTC slots as `YYYY-MM-DDTHH:MM:SS.sssZ`; that shape is read by slicing.
+    Anything else goes through fromisoformat/strptime.
     """
+    if iso_start.endswith("Z") and len(iso_start) >= 20 and iso_start[10] == "T":
+        return datetime(
+            int(iso_start[0:4]),
+            int(iso_start[5:7]),
+            int(iso_start[8:10]),
+            int(iso_start[11:13]),
+            int(iso_start[14:16]),
+            int(iso_start[17:19]),
+            tzinfo=_UTC,
+        )
+    if "+" in iso_start or iso_start.endswith("Z"):
+        dt_utc = datetime.fromisoformat(iso_start.replace("Z", "+00:00"))
+    else:
+        dt_utc = datetime.strptime(iso_start[:19], "%Y-%m-%dT%H:%M:%S").replace(tzinfo=_UTC)
+    if dt_utc.tzinfo is None:
+        dt_utc = dt_utc.replace(tzinfo=_UTC)
+    return dt_utc
+
+
+# Spoken 12-hour clock for every minute of the day, indexed by hour * 60 + minute.
+_CLOCK_12H = tuple(
+    f"{h % 12 or 12}:{m:02d} {'AM' if h < 12 else 'PM'}" for h in range(24) for m in range(60)
+)
+
+
+def _display_tz(timezone: str) -> ZoneInfo:
     try:
-        if "+" in iso_start or iso_start.endswith("Z"):
-            dt_utc = datetime.fromisoformat(iso_start.replace("Z", "+00:00"))
-        else:
-            dt_utc = datetime.strptime(iso_start[:19], "%Y-%m-%dT%H:%M:%S").replace(
-                tzinfo=ZoneInfo("UTC")
-            )
-        if dt_utc.tzinfo is None:
-            dt_utc = dt_utc.replace(tzinfo=ZoneInfo("UTC"))
-        try:
-            tz = ZoneInfo(timezone)
-        except Exception:
-            tz = ZoneInfo("Asia/Kolkata")
-        dt_local = dt_utc.astimezone(tz)
-        h, m = dt_local.hour, dt_local.minute
-        if h == 0:
-            return f"12:{m:02d} AM"
-        if h < 12:
-            return f"{h}:{m:02d} AM"
-        if h == 12:
-            return f"12:{m:02d} PM"
-        return f"{h - 12}:{m:02d} PM"
+        return _tz(timezone)
+    except Exception:
+        return _tz("Asia/Kolkata")
+
+
+def _format_slot_time_in(iso_start: str, tz: ZoneInfo) -> str:
+    """Spoken local time of a UTC slot start in an already-resolved zone."""
+    try:
+        dt_local = _parse_slot_start(iso_start).astimezone(tz)
+        return _CLOCK_12H[dt_local.hour * 60 + dt_local.minute]
     except Exception:
         return iso_start[:16].replace("T", " ")
 
 
-async def get_available_slots(
-    start_date: str,
-    end_date: str,
-    timezone: str = "Asia/Kolkata",
-) -> str:
-    """Fetch available Cal.com slots for the given date range.
+def _format_slot_time(iso_start: str, timezone: str = "Asia/Kolkata") -> str:
+    """Format ISO start time for voice in the given timezone (e.g. 09:00 -> 9:00 AM).
+    Cal.com returns slots in UTC; we convert to the user's timezone for display.
+    """
+    return _format_slot_time_in(iso_start, _display_tz(timezone))
+
+
+async def fetch_slots_by_date(start_date: str, end_date: str) -> dict[str, list[dict]] | str:
+    """Fetch raw Cal.com slots for an inclusive date range.
 
     Args:
         start_date: Start of range (YYYY-MM-DD).
         end_date: End of range (YYYY-MM-DD), inclusive.
-        timezone: IANA timezone (e.g. Asia/Kolkata) to display slot times in. Default Asia/Kolkata.
 
     Returns:
-        Human-readable summary of available slots per day for the agent to read to the user,
-        or an error message.
+        Slots keyed by date (YYYY-MM-DD), each a list of {"start": ISO string} dicts,
+        or a human-readable error message for the agent.
     """
     _require_calcom_config()
 
+    key = (start_date.strip(), end_date.strip())
+    cached = _slots_cache.get(key)
+    if cached is not None:
+        stored_at, slots_by_date = cached
+        if time.monotonic() - stored_at < SLOTS_CACHE_TTL_SEC:
+            _slots_cache.move_to_end(key)
+            logger.info("get_available_slots: cache hit start_date=%s end_date=%s", *key)
+            return slots_by_date
+        del _slots_cache[key]
+
     # Cal.com slots API expects startTime and endTime in ISO format for the range
     start_time = f"{start_date.strip()}T00:00:00"
     end_time = f"{end_date.strip()}T23:59:59"
@@ -102,20 +251,14 @@ async def get_available_slots(
         start_date, end_date, start_time, end_time,
     )
 
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(
-            f"{settings.CALCOM_BASE_URL.rstrip('/')}/slots",
-            params={
-                "eventTypeId": settings.CALCOM_EVENT_TYPE_ID,
-                "start": start_time,
-                "end": end_time,
-            },
-            headers={
-                "Authorization": f"Bearer {settings.CALCOM_API_KEY}",
-                "cal-api-version": settings.CALCOM_API_VERSION,
-            },
-            timeout=15.0,
-        )
+    resp = await _get_client().get(
+        f"{settings.CALCOM_BASE_URL.rstrip('/')}/slots",
+        params={
+            "eventTypeId": settings.CALCOM_EVENT_TYPE_ID,
+            "start": start_time,
+            "end": end_time,
+        },
+    )
 
     if resp.status_code >= 400:
         try:
@@ -140,21 +283,31 @@ async def get_available_slots(
         return result
 
     slots_by_date = data.get("data") or {}
+    _slots_cache[key] = (time.monotonic(), slots_by_date)
+    if len(_slots_cache) > SLOTS_CACHE_MAXSIZE:
+        _slots_cache.popitem(last=False)
+    return slots_by_date
+
+
+def format_slots_summary(
+    slots_by_date: dict[str, list[dict]],
+    start_date: str,
+    end_date: str,
+    timezone: str = "Asia/Kolkata",
+) -> str:
+    """Render slots keyed by date as a spoken summary in the given timezone."""
     if not slots_by_date:
         return f"No available slots between {start_date} and {end_date}."
 
-    lines = []
-    for date_key in sorted(slots_by_date.keys()):
-        slots = slots_by_date[date_key]
-        if not slots:
-            continue
-        times = [
-            _format_slot_time(s.get("start", ""), timezone=timezone)
-            for s in slots
-            if s.get("start")
-        ]
-        if times:
-            lines.append(f"On {date_key} available times are: {', '.join(times)}.")
+    tz = _display_tz(timezone)
+    lines = [
+        f"On {date_key} available times are: {', '.join(times)}."
+        for date_key, times in (
+            (d, [_format_slot_time_in(s["start"], tz) for s in slots_by_date[d] if s.get("start")])
+            for d in sorted(slots_by_date)
+        )
+        if times
+    ]
 
     if not lines:
         result = f"No available slots between {start_date} and {end_date}."
@@ -166,6 +319,51 @@ async def get_available_slots(
     return result
 
 
+# Above this many slots, summary formatting runs in a worker thread to keep the event loop free.
+SLOTS_FORMAT_THREAD_MIN = 50
+
+
+async def aformat_slots_summary(
+    slots_by_date: dict[str, list[dict]],
+    start_date: str,
+    end_date: str,
+    timezone: str = "Asia/Kolkata",
+) -> str:
+    """`format_slots_summary`, offloaded to a thread for large slot sets."""
+    if sum(map(len, slots_by_date.values())) > SLOTS_FORMAT_THREAD_MIN:
+        return await asyncio.to_thread(
+            format_slots_summary, slots_by_date, start_date, end_date, timezone
+        )
+    return format_slots_summary(slots_by_date, start_date, end_date, timezone=timezone)
+
+
+async def get_available_slots(
+    start_date: str,
+    end_date: str,
+    timezone: str = "Asia/Kolkata",
+) -> str:
+    """Fetch available Cal.com slots for the given date range.
+
+    Args:
+        start_date: Start of range (YYYY-MM-DD).
+        end_date: End of range (YYYY-MM-DD), inclusive.
+        timezone: IANA timezone (e.g. Asia/Kolkata) to display slot times in. Default Asia/Kolkata.
+
+    Returns:
+        Human-readable summary of available slots per day for the agent to read to the user,
+        or an error message.
+    """
+    slots_by_date = await fetch_slots_by_date(start_date, end_date)
+    if isinstance(slots_by_date, str):
+        return slots_by_date
+    return await aformat_slots_summary(slots_by_date, start_date, end_date, timezone=timezone)
+
+
+def _json_dumps(obj: object) -> bytes:
+    """Compact UTF-8 JSON request body."""
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
 async def create_calcom_booking(
     *,
     attendee_name: str,
@@ -173,7 +371,7 @@ async def create_calcom_booking(
     timezone: str,
     start: str,
     notes: str | None = None,
-) -> str:
+) -> BookingResult:
     """Create a booking via Cal.com API v2 (POST /bookings).
 
     Uses attendee (name, email, timeZone), start (ISO UTC), eventTypeId.
@@ -183,7 +381,7 @@ async def create_calcom_booking(
 
     # Do not send lengthInMinutes - Cal.com event types with a single fixed duration reject it
     payload = {
-        "eventTypeId": int(settings.CALCOM_EVENT_TYPE_ID),
+        "eventTypeId": _event_type_id(),
         "start": start,
         "attendee": {
             "name": attendee_name,
@@ -195,22 +393,12 @@ async def create_calcom_booking(
     if notes:
         payload["metadata"] = {"notes": notes}
 
-    booking_api_version = getattr(
-        settings, "CALCOM_BOOKING_API_VERSION", "2024-08-13"
+    resp = await _get_client().post(
+        f"{settings.CALCOM_BASE_URL.rstrip('/')}/bookings",
+        content=_json_dumps(payload),
+        headers=_booking_headers(),
     )
 
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            f"{settings.CALCOM_BASE_URL.rstrip('/')}/bookings",
-            json=payload,
-            headers={
-                "Authorization": f"Bearer {settings.CALCOM_API_KEY}",
-                "Content-Type": "application/json",
-                "cal-api-version": booking_api_version,
-            },
-            timeout=15.0,
-        )
-
     if resp.status_code >= 400:
         try:
             err = resp.json()
@@ -222,14 +410,16 @@ async def create_calcom_booking(
             "create_calcom_booking: FAILED status=%s body=%s -> result=%s",
             resp.status_code, resp.text[:500], result,
         )
-        return result
+        return BookingResult(ok=False, message=result)
 
+    # The booked slot is gone; do not serve it from cache.
+    _invalidate_slots_for_day(start[:10])
     data = resp.json()
     booking = data.get("booking", data)
     start_time = booking.get("startTime") or start
     result = f"Meeting booked successfully for {start_time}. Confirmation has been sent to {attendee_email}."
     logger.info("create_calcom_booking: SUCCESS -> result=%s", result)
-    return result
+    return BookingResult(ok=True, message=result, start_utc_iso=start)
 
 
 async def book_meeting(
@@ -239,7 +429,7 @@ async def book_meeting(
     time_slot: str,
     timezone: str = "UTC",
     notes: str | None = None,
-) -> str:
+) -> BookingResult:
     """Book a meeting with the founder via Cal.com. Use after the user has chosen a slot from the available options.
 
     Args:
@@ -251,7 +441,7 @@ async def book_meeting(
         notes: Optional notes for the meeting.
 
     Returns:
-        Success or error message string.
+        BookingResult with the success or error message for the agent.
     """
     logger.info(
         "book_meeting: request attendee=%s email=%s date=%s time_slot=%s timezone=%s",
@@ -262,11 +452,11 @@ async def book_meeting(
     except ValueError as e:
         result = f"Invalid date or time: {e}"
         logger.warning("book_meeting: validation failed -> result=%s", result)
-        return result
+        return BookingResult(ok=False, message=result)
     except Exception as e:
         result = f"Invalid timezone or time: {e}"
         logger.warning("book_meeting: validation failed -> result=%s", result)
-        return result
+        return BookingResult(ok=False, message=result)
 
     return await create_calcom_booking(
         attendee_name=attendee_name,
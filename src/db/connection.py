@@ -7,7 +7,7 @@ from __future__ import annotations
 from contextlib import contextmanager
 from typing import Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import Connection, create_engine, event
 from sqlalchemy.orm import Session, sessionmaker
 
 from src.config.settings import settings
@@ -24,11 +24,42 @@ def get_database_url() -> str:
     return url
 
 
+# libpq TCP keepalives: probe idle pooled sockets so a proxy or managed PG that drops them
+# is noticed by the OS instead of on the next session capture.
+_PG_KEEPALIVE_ARGS = {
+    "keepalives": 1,
+    "keepalives_idle": 30,
+    "keepalives_interval": 10,
+    "keepalives_count": 3,
+}
+
+
+def _connect_args(url: str) -> dict:
+    """DBAPI connect() arguments for the configured driver."""
+    if not url.startswith("postgresql"):
+        return {}
+    args = dict(_PG_KEEPALIVE_ARGS)
+    if url.startswith("postgresql+psycopg:"):
+        # psycopg 3 only: prepare server-side from the second execution on a connection
+        # (default is the sixth), so the few session-capture statements skip parse/plan
+        # once a pooled connection has seen them. Behind PgBouncer in transaction mode this
+        # needs PgBouncer >= 1.21 with max_prepared_statements set.
+        args["prepare_threshold"] = 1
+    return args
+
+
 def create_db_engine():
     """Create SQLAlchemy engine from DATABASE_URL (postgresql+psycopg://...)."""
+    url = get_database_url()
     return create_engine(
-        get_database_url(),
+        url,
+        connect_args=_connect_args(url),
         pool_pre_ping=True,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE_SEC,
+        # Reuse the most recently returned connection so idle ones can age out.
+        pool_use_lifo=True,
         echo=False,
     )
 
@@ -59,6 +90,29 @@ def get_session_factory() -> sessionmaker[Session]:
     return _SessionLocal
 
 
+class StatementCount:
+    """Running total for `count_statements`."""
+
+    def __init__(self) -> None:
+        self.total = 0
+
+    def on_execute(self, *_args) -> None:
+        self.total += 1
+
+
+@contextmanager
+def count_statements(conn: Connection) -> Generator[StatementCount, None, None]:
+    """Count the statements `conn` sends inside the block (one DB round trip each).
+
+    Runtime queries go through the sqlc queriers, which return plain rows rather than ORM
+    objects, so there are no lazy loads to forbid; counting is how extra round trips show up.
+    """
+    counter = StatementCount()
+    # Listeners on a Connection are per-object and go away with it; nothing to remove.
+    event.listen(conn, "before_cursor_execute", counter.on_execute)
+    yield counter
+
+
 @contextmanager
 def get_session() -> Generator[Session, None, None]:
     """Context manager yielding a DB session (commit on exit, rollback on exception)."""
@@ -0,0 +1,66 @@
+"""Index the pending-analysis poll and per-user booking listing.
+
+Revision ID: 20261015_001
+Revises: 20260217_001
+Create Date: 2026-10-15
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261015_001"
+down_revision: Union[str, None] = "20260217_001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction, and keeps session-end writes unblocked.
+    with op.get_context().autocommit_block():
+        # GetPendingSessions: WHERE analysis_status = 'pending' ORDER BY created_at.
+        op.create_index(
+            "ix_sessions_pending_created_at",
+            "sessions",
+            ["created_at"],
+            unique=False,
+            postgresql_where=sa.text("analysis_status = 'pending'"),
+            postgresql_concurrently=True,
+        )
+        # GetBookingsByUserID: WHERE user_id = $1 ORDER BY scheduled_time DESC.
+        op.create_index(
+            "ix_bookings_user_id_scheduled_time",
+            "bookings",
+            ["user_id", "scheduled_time"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_bookings_user_id",
+            table_name="bookings",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_bookings_user_id",
+            "bookings",
+            ["user_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_bookings_user_id_scheduled_time",
+            table_name="bookings",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_sessions_pending_created_at",
+            table_name="sessions",
+            postgresql_concurrently=True,
+        )
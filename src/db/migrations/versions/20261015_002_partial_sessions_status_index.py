@@ -0,0 +1,57 @@
+"""Make the per-user analysis-status index partial.
+
+Revision ID: 20261015_002
+Revises: 20261015_001
+Create Date: 2026-10-15
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261015_002"
+down_revision: Union[str, None] = "20261015_001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_OPEN_STATUSES = "analysis_status IN ('pending', 'in_progress', 'failed')"
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction, and keeps session-end inserts unblocked.
+    with op.get_context().autocommit_block():
+        # ix_sessions_user_id still serves user_id lookups (and the ON DELETE CASCADE
+        # from users) for the rows the partial index leaves out.
+        op.drop_index(
+            "ix_sessions_user_id_analysis_status",
+            table_name="sessions",
+            postgresql_concurrently=True,
+        )
+        # Completed sessions dominate and are never looked up by status.
+        op.create_index(
+            "ix_sessions_user_id_analysis_status",
+            "sessions",
+            ["user_id", "analysis_status"],
+            unique=False,
+            postgresql_where=sa.text(_OPEN_STATUSES),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_sessions_user_id_analysis_status",
+            table_name="sessions",
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_sessions_user_id_analysis_status",
+            "sessions",
+            ["user_id", "analysis_status"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
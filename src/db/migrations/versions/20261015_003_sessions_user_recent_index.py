@@ -0,0 +1,54 @@
+"""Index a user's sessions by recency; it replaces the plain sessions.user_id index.
+
+Revision ID: 20261015_003
+Revises: 20261015_002
+Create Date: 2026-10-15
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261015_003"
+down_revision: Union[str, None] = "20261015_002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # "Recent sessions for this user" reads straight off the index, newest first;
+        # the INCLUDE columns spare the heap fetch when only the summary is needed.
+        op.create_index(
+            "ix_sessions_user_id_started_at",
+            "sessions",
+            ["user_id", sa.text("started_at DESC")],
+            unique=False,
+            postgresql_include=["booking_made", "duration_sec"],
+            postgresql_concurrently=True,
+        )
+        # Covered by the leading column of ix_sessions_user_id_started_at.
+        op.drop_index(
+            "ix_sessions_user_id",
+            table_name="sessions",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_sessions_user_id",
+            "sessions",
+            ["user_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_sessions_user_id_started_at",
+            table_name="sessions",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,241 @@
+# Code generated by sqlc. DO NOT EDIT.
+# versions:
+#   sqlc v1.30.0
+# source: session_capture.sql
+import dataclasses
+import datetime
+from typing import Optional
+
+import sqlalchemy
+import sqlalchemy.ext.asyncio
+
+from src.db.sqlc import models
+
+
+CAPTURE_SESSION_BY_EMAIL = """-- name: capture_session_by_email \\:one
+WITH u AS (
+    INSERT INTO users (id, email, name, created_at, last_seen_at, total_sessions, total_bookings)
+    VALUES (
+        :p1,
+        :p2,
+        :p3,
+        now(),
+        now(),
+        1,
+        CASE WHEN CAST(:p4 AS boolean) THEN 1 ELSE 0 END
+    )
+    ON CONFLICT (email)
+    DO UPDATE SET
+      name = COALESCE(EXCLUDED.name, users.name),
+      last_seen_at = now(),
+      total_sessions = users.total_sessions + 1,
+      total_bookings = users.total_bookings + EXCLUDED.total_bookings
+    RETURNING id
+),
+p AS (
+    INSERT INTO user_profiles (user_id, booked_before, last_visit_at, created_at)
+    SELECT id, :p4, now(), now() FROM u
+    ON CONFLICT (user_id)
+    DO UPDATE SET
+      booked_before = user_profiles.booked_before OR EXCLUDED.booked_before,
+      last_visit_at = now()
+),
+s AS (
+    INSERT INTO sessions (
+        id, user_id, started_at, ended_at, duration_sec, booking_made,
+        analysis_status, analysis_version, r2_report_path, r2_audio_path,
+        analysis_attempts, last_analysis_at, error_message
+    )
+    SELECT
+        :p5, id, :p6, :p7, :p8,
+        :p4, 'pending', :p9, :p10,
+        NULL, 0, NULL, NULL
+    FROM u
+),
+b AS (
+    INSERT INTO bookings (id, session_id, user_id, scheduled_time, timezone, status)
+    SELECT :p11, :p5, id, :p12, :p13, 'scheduled'
+    FROM u
+    WHERE CAST(:p12 AS timestamptz) IS NOT NULL
+)
+SELECT id FROM u
+"""
+
+
+@dataclasses.dataclass()
+class CaptureSessionByEmailParams:
+    user_id: str
+    email: str
+    name: Optional[str]
+    booking_made: bool
+    session_id: str
+    started_at: datetime.datetime
+    ended_at: Optional[datetime.datetime]
+    duration_sec: Optional[int]
+    analysis_version: int
+    r2_report_path: Optional[str]
+    booking_id: str
+    scheduled_time: Optional[datetime.datetime]
+    booking_timezone: Optional[str]
+
+
+CAPTURE_SESSION_BY_VISITOR_ID = """-- name: capture_session_by_visitor_id \\:one
+WITH u AS (
+    INSERT INTO users (id, visitor_id, email, name, created_at, last_seen_at, total_sessions, total_bookings)
+    VALUES (
+        :p1,
+        :p2,
+        :p3,
+        :p4,
+        now(),
+        now(),
+        1,
+        CASE WHEN CAST(:p5 AS boolean) THEN 1 ELSE 0 END
+    )
+    ON CONFLICT (visitor_id)
+    DO UPDATE SET
+      email = COALESCE(EXCLUDED.email, users.email),
+      name = COALESCE(EXCLUDED.name, users.name),
+      last_seen_at = now(),
+      total_sessions = users.total_sessions + 1,
+      total_bookings = users.total_bookings + EXCLUDED.total_bookings
+    RETURNING id
+),
+p AS (
+    INSERT INTO user_profiles (user_id, booked_before, last_visit_at, created_at)
+    SELECT id, :p5, now(), now() FROM u
+    ON CONFLICT (user_id)
+    DO UPDATE SET
+      booked_before = user_profiles.booked_before OR EXCLUDED.booked_before,
+      last_visit_at = now()
+),
+s AS (
+    INSERT INTO sessions (
+        id, user_id, started_at, ended_at, duration_sec, booking_made,
+        analysis_status, analysis_version, r2_report_path, r2_audio_path,
+        analysis_attempts, last_analysis_at, error_message
+    )
+    SELECT
+        :p6, id, :p7, :p8, :p9,
+        :p5, 'pending', :p10, :p11,
+        NULL, 0, NULL, NULL
+    FROM u
+),
+b AS (
+    INSERT INTO bookings (id, session_id, user_id, scheduled_time, timezone, status)
+    SELECT :p12, :p6, id, :p13, :p14, 'scheduled'
+    FROM u
+    WHERE CAST(:p13 AS timestamptz) IS NOT NULL
+)
+SELECT id FROM u
+"""
+
+
+@dataclasses.dataclass()
+class CaptureSessionByVisitorIDParams:
+    user_id: str
+    visitor_id: str
+    email: Optional[str]
+    name: Optional[str]
+    booking_made: bool
+    session_id: str
+    started_at: datetime.datetime
+    ended_at: Optional[datetime.datetime]
+    duration_sec: Optional[int]
+    analysis_version: int
+    r2_report_path: Optional[str]
+    booking_id: str
+    scheduled_time: Optional[datetime.datetime]
+    booking_timezone: Optional[str]
+
+
+class Querier:
+    def __init__(self, conn: sqlalchemy.engine.Connection):
+        self._conn = conn
+
+    def capture_session_by_email(self, arg: CaptureSessionByEmailParams) -> Optional[str]:
+        row = self._conn.execute(sqlalchemy.text(CAPTURE_SESSION_BY_EMAIL), {
+            "p1": arg.user_id,
+            "p2": arg.email,
+            "p3": arg.name,
+            "p4": arg.booking_made,
+            "p5": arg.session_id,
+            "p6": arg.started_at,
+            "p7": arg.ended_at,
+            "p8": arg.duration_sec,
+            "p9": arg.analysis_version,
+            "p10": arg.r2_report_path,
+            "p11": arg.booking_id,
+            "p12": arg.scheduled_time,
+            "p13": arg.booking_timezone,
+        }).first()
+        if row is None:
+            return None
+        return row[0]
+
+    def capture_session_by_visitor_id(self, arg: CaptureSessionByVisitorIDParams) -> Optional[str]:
+        row = self._conn.execute(sqlalchemy.text(CAPTURE_SESSION_BY_VISITOR_ID), {
+            "p1": arg.user_id,
+            "p2": arg.visitor_id,
+            "p3": arg.email,
+            "p4": arg.name,
+            "p5": arg.booking_made,
+            "p6": arg.session_id,
+            "p7": arg.started_at,
+            "p8": arg.ended_at,
+            "p9": arg.duration_sec,
+            "p10": arg.analysis_version,
+            "p11": arg.r2_report_path,
+            "p12": arg.booking_id,
+            "p13": arg.scheduled_time,
+            "p14": arg.booking_timezone,
+        }).first()
+        if row is None:
+            return None
+        return row[0]
+
+
+class AsyncQuerier:
+    def __init__(self, conn: sqlalchemy.ext.asyncio.AsyncConnection):
+        self._conn = conn
+
+    async def capture_session_by_email(self, arg: CaptureSessionByEmailParams) -> Optional[str]:
+        row = (await self._conn.execute(sqlalchemy.text(CAPTURE_SESSION_BY_EMAIL), {
+            "p1": arg.user_id,
+            "p2": arg.email,
+            "p3": arg.name,
+            "p4": arg.booking_made,
+            "p5": arg.session_id,
+            "p6": arg.started_at,
+            "p7": arg.ended_at,
+            "p8": arg.duration_sec,
+            "p9": arg.analysis_version,
+            "p10": arg.r2_report_path,
+            "p11": arg.booking_id,
+            "p12": arg.scheduled_time,
+            "p13": arg.booking_timezone,
+        })).first()
+        if row is None:
+            return None
+        return row[0]
+
+    async def capture_session_by_visitor_id(self, arg: CaptureSessionByVisitorIDParams) -> Optional[str]:
+        row = (await self._conn.execute(sqlalchemy.text(CAPTURE_SESSION_BY_VISITOR_ID), {
+            "p1": arg.user_id,
+            "p2": arg.visitor_id,
+            "p3": arg.email,
+            "p4": arg.name,
+            "p5": arg.booking_made,
+            "p6": arg.session_id,
+            "p7": arg.started_at,
+            "p8": arg.ended_at,
+            "p9": arg.duration_sec,
+            "p10": arg.analysis_version,
+            "p11": arg.r2_report_path,
+            "p12": arg.booking_id,
+            "p13": arg.scheduled_time,
+            "p14": arg.booking_timezone,
+        })).first()
+        if row is None:
+            return None
+        return row[0]
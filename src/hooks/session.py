@@ -8,11 +8,15 @@ from livekit.plugins import noise_cancellation, silero
 from livekit.plugins.turn_detector.multilingual import MultilingualModel
 from livekit.plugins import groq, sarvam, cartesia, deepgram
 
-from src.agents.protfolio_agent import (
+from src.agents.portfolio_agent import (
     BookingUserData,
     ConversationState,
     PortfolioAssistant,
 )
+from src.agents.tools.cal_com_booking import aclose_client as aclose_calcom_client
+
+# Compiled once: the text-input handler runs on every typed message.
+_EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
 
 
 def _custom_text_input_handler(
@@ -30,7 +34,7 @@ def _custom_text_input_handler(
     ):
         # If the user typed a compact string like "Alice, alice@example.com",
         # rewrite it to explicit fields so extraction is deterministic.
-        email_match = re.search(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", message)
+        email_match = _EMAIL_RE.search(message)
         if email_match:
             email = email_match.group(0).strip()
             name = message[: email_match.start()].strip(" ,:-")
@@ -42,6 +46,9 @@ def _custom_text_input_handler(
 
 
 async def portfolio_agent_handler(ctx: agents.JobContext):
+    # The Cal.com client is shared across tool calls; release its connections with the job.
+    ctx.add_shutdown_callback(aclose_calcom_client)
+
     session = AgentSession(
         # stt="assemblyai/universal-streaming-multilingual",
         # stt="deepgram/nova-3:multi",
@@ -54,6 +61,9 @@ async def portfolio_agent_handler(ctx: agents.JobContext):
         ),
         llm=groq.LLM(
             model="openai/gpt-oss-20b",
+            # Let the model emit e.g. get_current_datetime + get_available_slots in one
+            # response; the session runs them concurrently.
+            parallel_tool_calls=True,
         ),
         tts=cartesia.TTS(
         model="sonic-3",
@@ -63,6 +73,9 @@ async def portfolio_agent_handler(ctx: agents.JobContext):
         
         vad=silero.VAD.load(),
         turn_detection=MultilingualModel(),
+        # Once the turn detector predicts end of turn, hand the transcript to the LLM sooner
+        # (default 0.5s); unsure turns still wait up to max_endpointing_delay.
+        min_endpointing_delay=0.3,
         userdata=BookingUserData(),
     )
 
@@ -9,13 +9,34 @@ import hashlib
 import json
 import re
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
 from livekit.agents import JobContext
 
+from src.config.settings import settings
+from src.db.connection import count_statements, get_engine
+from src.db.models import uuid7_hex
+from src.db.sqlc import SessionCaptureQuerier
+from src.db.sqlc.session_capture import (
+    CaptureSessionByEmailParams,
+    CaptureSessionByVisitorIDParams,
+)
+from src.storage import r2 as storage_r2
 from src.utils.logging import logger
 
-# Optional dependencies: only use when configured
+# DB writes at session end run here rather than on the default executor: a burst of endings
+# then queues in Python instead of every thread blocking on an exhausted connection pool.
+# concurrent.futures joins these threads at interpreter exit, so no explicit shutdown.
+_DB_WRITE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=settings.DB_POOL_SIZE, thread_name_prefix="session-capture-db"
+)
+
+_EMAIL_IDENTITY_RE = re.compile(r"^[^@]+@[^@]+\.[^@]+$")
+_HEX32_RE = re.compile(r"[a-fA-F0-9]{32}")
+_ROOM_UNSAFE_RE = re.compile(r"[^a-zA-Z0-9_-]")
+
+
 def _report_to_dict(report):
     """Build JSON-serializable dict from SessionReport (include started_at/duration)."""
     d = report.to_dict()
@@ -27,7 +48,7 @@ def _report_to_dict(report):
 
 
 def _identity_looks_like_email(identity: str) -> bool:
-    return bool(identity and re.match(r"^[^@]+@[^@]+\.[^@]+$", identity.strip()))
+    return bool(identity and _EMAIL_IDENTITY_RE.match(identity.strip()))
 
 
 def _normalize_visitor_id(identity: str) -> tuple[str | None, bool]:
@@ -49,7 +70,7 @@ def _normalize_visitor_id(identity: str) -> tuple[str | None, bool]:
     except Exception:
         pass
 
-    if re.fullmatch(r"[a-fA-F0-9]{32}", s):
+    if _HEX32_RE.fullmatch(s):
         return s.lower(), False
 
     # Stable fallback for unexpected identity formats.
@@ -66,8 +87,27 @@ def _get_participant_identity(ctx: JobContext) -> str | None:
     return None
 
 
-def _capture_sync(
-    report_dict: dict,
+def _report_json_bytes(report_dict: dict) -> bytes:
+    """UTF-8 JSON body for the R2 report; anything not natively serializable is str()-ed."""
+    return json.dumps(report_dict, default=str).encode("utf-8")
+
+
+def _upload_report_sync(report_dict: dict, r2_key: str) -> None:
+    """Upload the session report to R2 when configured (runs in a thread)."""
+    if storage_r2.is_configured():
+        try:
+            storage_r2.upload_bytes(
+                r2_key,
+                _report_json_bytes(report_dict),
+                content_type="application/json",
+                # The key is per job: a retried capture must not rewrite an existing report.
+                overwrite=False,
+            )
+        except Exception as e:
+            logger.warning("Session capture: R2 upload failed for %s: %s", r2_key, e)
+
+
+def _persist_session_sync(
     r2_key: str,
     job_id: str,
     room_name: str,
@@ -78,142 +118,101 @@ def _capture_sync(
     conv_email: str | None = None,
     booking_details=None,
 ) -> None:
-    """Run R2 upload and DB writes in a thread (sync)."""
-    from src.config.settings import settings
-    from src.db.connection import get_engine
-    from src.db.sqlc import BookingsQuerier, SessionsQuerier, UserProfilesQuerier, UsersQuerier
-    from src.db.sqlc.bookings import InsertBookingParams
-    from src.db.sqlc.sessions import InsertSessionParams
-    from src.db.sqlc.user_profiles import UpsertUserProfileParams
-    from src.storage import r2 as storage_r2
-
-    # 1) Upload report to R2
-    if settings.R2_ENDPOINT and settings.R2_BUCKET and settings.R2_ACCESS_KEY_ID and settings.R2_SECRET_ACCESS_KEY:
-        try:
-            storage_r2.upload_bytes(
-                r2_key,
-                json.dumps(report_dict, default=str).encode("utf-8"),
-                content_type="application/json",
-            )
-        except Exception as e:
-            logger.warning("Session capture: R2 upload failed for %s: %s", r2_key, e)
+    """Persist user + session in the DB (runs in a thread, alongside the R2 upload).
 
-    # 2) Persist user + session in DB
+    r2_report_path is set from the deterministic key whether or not the upload succeeds.
+    """
     if not settings.DATABASE_URL:
         return
-    try:
-        engine = get_engine()
-    except RuntimeError:
-        return
+    # Already built by the process prewarm; get_engine only raises when DATABASE_URL is unset.
+    engine = get_engine()
     visitor_id: str | None = None
-    # Simple heuristic: check if a successful booking message appears anywhere
-    # in the session report. This lets us mark both the session row and the
-    # long-term user profile as "booked_before" without wiring a separate
-    # channel from the agent.
-    report_text = ""
-    try:
-        report_text = json.dumps(report_dict, default=str)
-    except Exception:
-        report_text = str(report_dict)
-    booking_made = "Meeting booked successfully" in report_text
-
-    with engine.connect() as conn:
-        with conn.begin():
-            users = UsersQuerier(conn)
-            profiles = UserProfilesQuerier(conn)
-            sessions_querier = SessionsQuerier(conn)
-            bookings_querier = BookingsQuerier(conn)
-            user_id = uuid.uuid4().hex[:32]
-
-            email: str | None = None
-            name: str | None = None
-
-            if participant_identity:
-                if _identity_looks_like_email(participant_identity):
-                    email = participant_identity.strip()
-                else:
-                    visitor_id, used_hash = _normalize_visitor_id(participant_identity)
-                    if visitor_id and used_hash:
-                        logger.warning(
-                            "Session capture: participant identity not uuid/hex; hashed to visitor_id. identity=%r",
-                            participant_identity,
-                        )
-
-            # Prefer conversation-collected name/email over identity heuristics.
-            if conv_name:
-                name = conv_name
-            if conv_email:
-                email = conv_email
-
-            if visitor_id:
-                user = users.upsert_user_by_visitor_id(id=user_id, visitor_id=visitor_id, email=email, name=name)
-            else:
-                # Fallback to email-based identity (or per-session anon email if missing).
-                if not email:
-                    email = f"anon-{job_id}@session.local"
-                user = users.upsert_user_by_email(id=user_id, email=email, name=name)
-
-            if user:
-                user_id = user.id
-            users.increment_user_session_count(id=user_id)
-            profiles.upsert_user_profile(
-                UpsertUserProfileParams(
-                    user_id=user_id,
-                    company=None,
-                    domain=None,
-                    last_intent_type=None,
-                    # Phase 5: mark users as having booked at least once when
-                    # we detect a successful booking in the session report.
-                    booked_before=booking_made or None,
-                )
-            )
+    # book_meeting records booking_details on BookingUserData only when Cal.com confirmed
+    # the booking, so it doubles as this session's "booking made" flag (session row and
+    # the long-term profile's booked_before).
+    booking_made = booking_details is not None
 
-            if started_at_ts is not None:
-                started_at = datetime.fromtimestamp(started_at_ts, tz=timezone.utc)
-            else:
-                started_at = datetime.now(timezone.utc)
-            ended_at = None
-            if started_at_ts is not None and duration_sec is not None:
-                ended_at = datetime.fromtimestamp(started_at_ts + duration_sec, tz=timezone.utc)
-            duration_int = int(duration_sec) if duration_sec is not None else None
-            r2_path = r2_key if (settings.R2_ENDPOINT and settings.R2_BUCKET) else None
-            sessions_querier.insert_session(
-                InsertSessionParams(
-                    id=job_id,
-                    user_id=user_id,
-                    started_at=started_at,
-                    ended_at=ended_at,
-                    duration_sec=duration_int,
-                    # Phase 5: persist whether a booking was made in this session.
-                    booking_made=booking_made,
-                    analysis_version=1,
-                    r2_report_path=r2_path,
-                    r2_audio_path=None,
+    user_id = uuid7_hex()
+    email: str | None = None
+    name: str | None = None
+
+    if participant_identity:
+        if _identity_looks_like_email(participant_identity):
+            email = participant_identity.strip()
+        else:
+            visitor_id, used_hash = _normalize_visitor_id(participant_identity)
+            if visitor_id and used_hash:
+                logger.warning(
+                    "Session capture: participant identity not uuid/hex; hashed to visitor_id. identity=%r",
+                    participant_identity,
                 )
+
+    # Prefer conversation-collected name/email over identity heuristics.
+    if conv_name:
+        name = conv_name
+    if conv_email:
+        email = conv_email
+
+    if started_at_ts is not None:
+        started_at = datetime.fromtimestamp(started_at_ts, tz=timezone.utc)
+    else:
+        started_at = datetime.now(timezone.utc)
+    ended_at = None
+    if started_at_ts is not None and duration_sec is not None:
+        ended_at = datetime.fromtimestamp(started_at_ts + duration_sec, tz=timezone.utc)
+    duration_int = int(duration_sec) if duration_sec is not None else None
+    r2_path = r2_key if (settings.R2_ENDPOINT and settings.R2_BUCKET) else None
+
+    # The booking row is only written when the agent recorded a parseable start time.
+    scheduled_dt: datetime | None = None
+    if booking_details is not None:
+        try:
+            scheduled_dt = datetime.fromisoformat(
+                booking_details.scheduled_time_utc_iso.replace("Z", "+00:00")
             )
+        except Exception as e:
+            logger.warning("Session capture: failed to parse booking time: %s", e)
 
-            if booking_made:
-                users.increment_user_booking_count(id=user_id)
-                if booking_details is not None:
-                    try:
-                        scheduled_dt = datetime.fromisoformat(
-                            booking_details.scheduled_time_utc_iso.replace("Z", "+00:00")
-                        )
-                        bookings_querier.insert_booking(
-                            InsertBookingParams(
-                                id=uuid.uuid4().hex[:32],
-                                session_id=job_id,
-                                user_id=user_id,
-                                scheduled_time=scheduled_dt,
-                                timezone=booking_details.timezone,
-                                status="scheduled",
-                            )
-                        )
-                    except Exception as e:
-                        logger.warning("Session capture: failed to insert booking row: %s", e)
+    # User upsert (with the session/booking counters), profile, session and booking rows
+    # go out as one statement: a single round trip.
+    common = dict(
+        user_id=user_id,
+        name=name,
+        # Phase 5: persist whether a booking was made in this session and mark the
+        # profile as having booked at least once.
+        booking_made=booking_made,
+        session_id=job_id,
+        started_at=started_at,
+        ended_at=ended_at,
+        duration_sec=duration_int,
+        analysis_version=1,
+        r2_report_path=r2_path,
+        booking_id=uuid7_hex(),
+        scheduled_time=scheduled_dt,
+        booking_timezone=booking_details.timezone if scheduled_dt is not None else None,
+    )
+
+    # A single statement is atomic on its own, so it runs in autocommit: no BEGIN/COMMIT
+    # round trips around it, and the pooled connection is returned sooner.
+    with engine.connect() as conn, count_statements(conn) as statements:
+        conn.execution_options(isolation_level="AUTOCOMMIT")
+        capture = SessionCaptureQuerier(conn)
+        if visitor_id:
+            stored_id = capture.capture_session_by_visitor_id(
+                CaptureSessionByVisitorIDParams(visitor_id=visitor_id, email=email, **common)
+            )
+        else:
+            # Fallback to email-based identity (or per-session anon email if missing).
+            if not email:
+                email = f"anon-{job_id}@session.local"
+            stored_id = capture.capture_session_by_email(
+                CaptureSessionByEmailParams(email=email, **common)
+            )
+        if stored_id:
+            user_id = stored_id
     logger.info(
-        "Session capture: report=%s user_id=%s session_id=%s visitor_id=%s",
-        r2_key, user_id, job_id, visitor_id,
+        "Session capture: report=%s user_id=%s session_id=%s visitor_id=%s statements=%d",
+        r2_key, user_id, job_id, visitor_id, statements.total,
     )
 
 
@@ -229,7 +228,7 @@ async def on_session_end(ctx: JobContext) -> None:
         return
     job_id = getattr(report, "job_id", "") or "unknown"
     room_name = getattr(report, "room", "") or getattr(report, "room_id", "") or "unknown"
-    room_name_safe = re.sub(r"[^a-zA-Z0-9_-]", "_", room_name)[:128]
+    room_name_safe = _ROOM_UNSAFE_RE.sub("_", room_name)[:128]
     r2_key = f"reports/{room_name_safe}/{job_id}.json"
     report_dict = _report_to_dict(report)
     started_at = getattr(report, "started_at", None)
@@ -237,27 +236,33 @@ async def on_session_end(ctx: JobContext) -> None:
     participant_identity = _get_participant_identity(ctx)
 
     # Extract name/email/booking_details collected during the conversation.
-    conv_name: str | None = None
-    conv_email: str | None = None
-    booking_details = None
+    # primary_session raises RuntimeError when no AgentSession was started for the job and
+    # userdata raises ValueError when it was never set; anything else is a real bug.
     try:
         ud = ctx.primary_session.userdata
-        conv_name = getattr(ud, "name", None)
-        conv_email = getattr(ud, "email", None)
-        booking_details = getattr(ud, "booking_details", None)
-    except Exception as e:
+    except (RuntimeError, ValueError) as e:
         logger.warning("Session capture: could not read userdata: %s", e)
+        ud = None
+    conv_name: str | None = getattr(ud, "name", None)
+    conv_email: str | None = getattr(ud, "email", None)
+    booking_details = getattr(ud, "booking_details", None)
 
-    await asyncio.to_thread(
-        _capture_sync,
-        report_dict,
-        r2_key,
-        job_id,
-        room_name,
-        participant_identity,
-        started_at,
-        duration,
-        conv_name,
-        conv_email,
-        booking_details,
+    # The R2 upload and the DB write are independent: run them side by side so session end
+    # waits for the slower of the two rather than their sum.
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(
+        asyncio.to_thread(_upload_report_sync, report_dict, r2_key),
+        loop.run_in_executor(
+            _DB_WRITE_EXECUTOR,
+            _persist_session_sync,
+            r2_key,
+            job_id,
+            room_name,
+            participant_identity,
+            started_at,
+            duration,
+            conv_name,
+            conv_email,
+            booking_details,
+        ),
     )
@@ -1,18 +1,26 @@
-import os
 import sys
 
-from dotenv import load_dotenv
-from livekit.agents import AgentServer, cli
+from livekit.agents import AgentServer, JobProcess, cli
 
+# Importing the handlers imports src.config.settings, which loads .env.local once for the process.
+from src.config.settings import settings
+from src.db.connection import get_engine
 from src.hooks.session import portfolio_agent_handler
 from src.hooks.session_capture import on_session_end
+from src.storage import r2 as storage_r2
 
-if os.path.exists(".env.local"):
-    load_dotenv(".env.local")
+
+def prewarm(proc: JobProcess) -> None:
+    # Build the DB engine and the R2 client once per job process, at boot, instead of inside
+    # the first session-end capture threads. No connection is opened until a capture needs one.
+    if settings.DATABASE_URL:
+        get_engine()
+    storage_r2.prewarm_client()
 
 
 def setup_server():
     server = AgentServer()
+    server.setup_fnc = prewarm
     server.rtc_session(agent_name="melvin", on_session_end=on_session_end)(
         portfolio_agent_handler
     )
@@ -4,74 +4,355 @@ Configure via R2_ENDPOINT, R2_BUCKET, R2_ACCESS_KEY_ID, R2_SECRET_ACCESS_KEY.
 """
 from __future__ import annotations
 
+import functools
+import gzip
+import io
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+
 from src.config.settings import settings
 
 
+@functools.cache
+def _r2_config() -> tuple[str | None, str | None, str | None, str | None]:
+    """(endpoint, bucket, access key id, secret) read from settings once per process.
+
+    Settings do not change at runtime; call _r2_config.cache_clear() after patching them.
+    """
+    return (
+        settings.R2_ENDPOINT,
+        settings.R2_BUCKET,
+        settings.R2_ACCESS_KEY_ID,
+        settings.R2_SECRET_ACCESS_KEY,
+    )
+
+
+def _bucket() -> str | None:
+    return _r2_config()[1]
+
+
+def is_configured() -> bool:
+    """True when all four R2 settings are present."""
+    return all(_r2_config())
+
+
 def _require_r2_config() -> None:
-    if not all(
-        [
-            settings.R2_ENDPOINT,
-            settings.R2_BUCKET,
-            settings.R2_ACCESS_KEY_ID,
-            settings.R2_SECRET_ACCESS_KEY,
-        ]
-    ):
+    if not is_configured():
         raise RuntimeError(
             "R2 is not configured. Set R2_ENDPOINT, R2_BUCKET, R2_ACCESS_KEY_ID, R2_SECRET_ACCESS_KEY."
         )
 
 
+UPLOAD_WORKERS = 8
+# Room for every upload worker plus a multipart transfer without urllib3 discarding
+# connections ("Connection pool is full").
+MAX_POOL_CONNECTIONS = UPLOAD_WORKERS * 2
+
+
+@functools.cache
 def _client():
-    """Lazy S3 client configured for R2."""
+    """Lazy S3 client configured for R2, built once per process.
+
+    boto3 clients are thread-safe, so the capture threads share it and its HTTPS connection
+    pool instead of paying endpoint setup and a TLS handshake per upload. A missing config
+    raises and is not cached.
+    """
     _require_r2_config()
     import boto3
+    from botocore.config import Config
 
-    return boto3.client(
+    endpoint, _, access_key_id, secret_access_key = _r2_config()
+    return boto3.session.Session().client(
         service_name="s3",
-        endpoint_url=settings.R2_ENDPOINT,
-        aws_access_key_id=settings.R2_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY,
+        endpoint_url=endpoint,
+        aws_access_key_id=access_key_id,
+        aws_secret_access_key=secret_access_key,
         region_name="auto",
+        config=Config(
+            retries={"max_attempts": 3, "mode": "standard"},
+            tcp_keepalive=True,
+            max_pool_connections=MAX_POOL_CONNECTIONS,
+        ),
+    )
+
+
+# Payloads at or above this size (e.g. session audio) are uploaded as concurrent multipart
+# parts by boto3's transfer manager; smaller ones stay a single PUT.
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+MULTIPART_CHUNKSIZE = 16 * 1024 * 1024
+MULTIPART_CONCURRENCY = 10
+
+
+@functools.cache
+def _transfer_config():
+    from boto3.s3.transfer import TransferConfig
+
+    return TransferConfig(
+        multipart_threshold=MULTIPART_THRESHOLD,
+        multipart_chunksize=MULTIPART_CHUNKSIZE,
+        max_concurrency=MULTIPART_CONCURRENCY,
+        use_threads=True,
     )
 
 
-def upload_bytes(key: str, data: bytes, content_type: str = "application/octet-stream") -> str:
+def prewarm_client() -> None:
+    """Build the shared client now (e.g. at process boot) when R2 is configured."""
+    if is_configured():
+        _client()
+
+
+# ETag of objects this process wrote, for conditional existence checks. Bounded; oldest
+# entries are dropped first.
+_ETAG_CACHE: dict[str, str] = {}
+_ETAG_CACHE_MAX = 1024
+
+
+def _remember_etag(key: str, etag: str | None) -> None:
+    if not etag:
+        return
+    _ETAG_CACHE.pop(key, None)
+    _ETAG_CACHE[key] = etag
+    while len(_ETAG_CACHE) > _ETAG_CACHE_MAX:
+        _ETAG_CACHE.pop(next(iter(_ETAG_CACHE)), None)
+
+
+# Text payloads (session reports) at or above this size are gzipped before upload unless the
+# caller says otherwise; already-compressed media (audio) is never auto-compressed.
+_COMPRESSIBLE_TYPES = frozenset({"application/json", "text/plain", "text/html", "application/xml"})
+COMPRESS_MIN_BYTES = 4 * 1024
+
+
+def _encode_body(data: bytes, content_type: str, compress: bool | None) -> tuple[bytes, dict[str, str]]:
+    """Body to send and its ContentType/ContentEncoding params, gzipping per upload_bytes rules."""
+    if compress is None:
+        compress = content_type in _COMPRESSIBLE_TYPES and len(data) >= COMPRESS_MIN_BYTES
+    if compress:
+        return gzip.compress(data, compresslevel=5), {"ContentType": content_type, "ContentEncoding": "gzip"}
+    return data, {"ContentType": content_type}
+
+
+def upload_bytes(
+    key: str,
+    data: bytes,
+    content_type: str = "application/octet-stream",
+    *,
+    overwrite: bool = True,
+    compress: bool | None = None,
+) -> str:
     """
     Upload bytes to R2 at the given key. Returns the key.
     Key format example: reports/{room_name}/{session_id}.json
+    With overwrite=False the PUT is conditional (If-None-Match: *): an object already at the
+    key is left as is and the call still succeeds, so retried uploads are idempotent.
+    Conditional uploads are always a single PUT; others at or above MULTIPART_THRESHOLD
+    go out as parallel multipart parts.
+    compress=None gzips text content types of COMPRESS_MIN_BYTES or more (stored with
+    Content-Encoding: gzip, undone by download_bytes); pass True/False to force it.
     """
     c = _client()
-    bucket = settings.R2_BUCKET
-    c.put_object(
-        Bucket=bucket,
-        Key=key,
-        Body=data,
-        ContentType=content_type,
-    )
+    from botocore.exceptions import ClientError
+
+    bucket = _bucket()
+    data, extra = _encode_body(data, content_type, compress)
+    if overwrite and len(data) >= MULTIPART_THRESHOLD:
+        c.upload_fileobj(
+            io.BytesIO(data),
+            bucket,
+            key,
+            ExtraArgs=extra,
+            Config=_transfer_config(),
+        )
+        return key
+    if not overwrite:
+        extra["IfNoneMatch"] = "*"
+    try:
+        resp = c.put_object(
+            Bucket=bucket,
+            Key=key,
+            Body=data,
+            **extra,
+        )
+        _remember_etag(key, resp.get("ETag"))
+    except ClientError as e:
+        if overwrite or e.response.get("Error", {}).get("Code") != "PreconditionFailed":
+            raise
     return key
 
 
-def download_bytes(key: str) -> bytes:
-    """Download object from R2 as bytes. Raises if key does not exist."""
+@functools.cache
+def _upload_pool() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=UPLOAD_WORKERS, thread_name_prefix="r2-upload")
+
+
+def upload_many(items: list[tuple[str, bytes, str]]) -> list[str]:
+    """
+    Upload several (key, data, content_type) items in parallel on the shared client.
+    Returns the keys in input order. Raises as soon as one upload fails; uploads already
+    in flight still complete and are not rolled back.
+    """
+    if len(items) < 2:
+        return [upload_bytes(key, data, content_type) for key, data, content_type in items]
+    pool = _upload_pool()
+    futures = [pool.submit(upload_bytes, key, data, content_type) for key, data, content_type in items]
+    done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+    for f in done:
+        if f.exception() is not None:
+            raise f.exception()
+    return [f.result() for f in futures]
+
+
+_DOWNLOAD_CHUNK = 1 << 20
+
+
+def download_bytes(key: str) -> bytes | bytearray:
+    """
+    Download object from R2. Raises if key does not exist.
+    The body is read in chunks into a buffer sized from Content-Length (one allocation, no
+    final concatenation) and that buffer is returned as is: a mutable bytearray the caller
+    owns. Objects stored with Content-Encoding: gzip are returned decompressed, as bytes.
+    """
     c = _client()
-    bucket = settings.R2_BUCKET
+    bucket = _bucket()
     resp = c.get_object(Bucket=bucket, Key=key)
-    return resp["Body"].read()
+    body = resp["Body"]
+    size = int(resp["ContentLength"])
+    buf = bytearray(size)
+    view = memoryview(buf)
+    off = 0
+    with body:
+        while off < size:
+            chunk = body.read(min(_DOWNLOAD_CHUNK, size - off))
+            if not chunk:
+                raise OSError(f"R2 object {key} truncated: got {off} of {size} bytes")
+            view[off : off + len(chunk)] = chunk
+            off += len(chunk)
+    if resp.get("ContentEncoding") == "gzip":
+        return gzip.decompress(buf)
+    return buf
+
+
+PRESIGNED_URL_TTL_SEC = 300
+
+
+@functools.cache
+def _http_client():
+    """Keep-alive HTTP client for presigned transfers, built once per process."""
+    import httpx
+
+    return httpx.Client(
+        timeout=60.0,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+    )
+
+
+def upload_bytes_presigned(
+    key: str,
+    data: bytes,
+    content_type: str = "application/octet-stream",
+    *,
+    compress: bool | None = None,
+) -> str:
+    """
+    Upload like upload_bytes, but send the bytes with a plain HTTP PUT to a presigned URL.
+    boto3 only signs the request; the body skips botocore's chunking and event hooks.
+    Always a single unconditional PUT. Returns the key.
+    """
+    c = _client()
+    data, params = _encode_body(data, content_type, compress)
+    url = c.generate_presigned_url(
+        "put_object",
+        Params={"Bucket": _bucket(), "Key": key, **params},
+        ExpiresIn=PRESIGNED_URL_TTL_SEC,
+        HttpMethod="PUT",
+    )
+    headers = {"Content-Type": params["ContentType"]}
+    if "ContentEncoding" in params:
+        headers["Content-Encoding"] = params["ContentEncoding"]
+    resp = _http_client().put(url, content=data, headers=headers)
+    resp.raise_for_status()
+    _remember_etag(key, resp.headers.get("ETag"))
+    return key
+
+
+def download_bytes_presigned(key: str) -> bytes:
+    """Download like download_bytes through a presigned GET URL. Raises if key does not exist."""
+    url = _client().generate_presigned_url(
+        "get_object",
+        Params={"Bucket": _bucket(), "Key": key},
+        ExpiresIn=PRESIGNED_URL_TTL_SEC,
+    )
+    resp = _http_client().get(url)
+    resp.raise_for_status()
+    # httpx already undoes Content-Encoding: gzip
+    return resp.content
 
 
 def delete(key: str) -> None:
     """Delete object at key. No-op if key does not exist."""
     c = _client()
-    bucket = settings.R2_BUCKET
+    bucket = _bucket()
     c.delete_object(Bucket=bucket, Key=key)
+    _ETAG_CACHE.pop(key, None)
+
+
+_MISSING_CODES = frozenset({"404", "NoSuchKey", "NotFound"})
 
 
 def exists(key: str) -> bool:
-    """Return True if an object exists at key."""
+    """Return True if an object exists at key. Errors other than "not found" propagate.
+
+    For keys this process wrote, the HEAD is conditional on the known ETag, so an unchanged
+    object answers with an empty 304.
+    """
     c = _client()
-    bucket = settings.R2_BUCKET
+    from botocore.exceptions import ClientError
+
+    bucket = _bucket()
+    etag = _ETAG_CACHE.get(key)
+    extra = {"IfNoneMatch": etag} if etag else {}
     try:
-        c.head_object(Bucket=bucket, Key=key)
+        resp = c.head_object(Bucket=bucket, Key=key, **extra)
+        _remember_etag(key, resp.get("ETag"))
         return True
-    except Exception:
-        return False
+    except ClientError as e:
+        code = e.response.get("Error", {}).get("Code")
+        if etag and code == "304":
+            return True
+        if code in _MISSING_CODES:
+            _ETAG_CACHE.pop(key, None)
+            return False
+        raise
+
+
+def exists_known(key: str) -> bool:
+    """True if this process uploaded key (and has not deleted it); no network call.
+
+    Only a positive answer is authoritative: False means "unknown", so fall back to exists().
+    """
+    return key in _ETAG_CACHE
+
+
+def list_keys(prefix: str, page_size: int = 1000) -> list[str]:
+    """All keys under prefix, one ListObjectsV2 request per page_size keys.
+
+    Meant for prefixes with a bounded number of objects (e.g. reports/{room_name}/); every
+    key under the prefix is fetched.
+    """
+    c = _client()
+    pages = c.get_paginator("list_objects_v2").paginate(
+        Bucket=_bucket(), Prefix=prefix, PaginationConfig={"PageSize": page_size}
+    )
+    return [obj["Key"] for page in pages for obj in page.get("Contents", ())]
+
+
+def exists_many(keys: list[str]) -> dict[str, bool]:
+    """Existence of several keys, listing their directory instead of one HEAD per key.
+
+    Only lists when every key sits in the same non-root directory (e.g. reports/{room_name}/);
+    otherwise a shared string prefix such as "reports/room" could page through the whole
+    bucket, so it falls back to per-key HEADs.
+    """
+    dirs = {key.rpartition("/")[0] for key in keys}
+    if len(keys) < 2 or len(dirs) != 1 or not next(iter(dirs)):
+        return {key: exists(key) for key in keys}
+    present = set(list_keys(f"{dirs.pop()}/"))
+    return {key: key in present for key in keys}
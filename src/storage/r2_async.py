@@ -0,0 +1,70 @@
+"""
+Async facade over the R2 client for use from the agent event loop.
+Each call runs the sync boto3 operation on a bounded worker pool sharing the one client, so
+many uploads overlap instead of blocking the loop or running one after another.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, TypeVar
+
+from src.storage import r2
+
+_T = TypeVar("_T")
+
+# One worker per client connection: more threads would only queue on the connection pool.
+_EXECUTOR = ThreadPoolExecutor(max_workers=r2.MAX_POOL_CONNECTIONS, thread_name_prefix="r2-async")
+
+# Upper bound on in-flight requests for upload_many; below the client's connection pool.
+MAX_CONCURRENT_UPLOADS = 10
+
+
+async def _offload(fn: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_EXECUTOR, functools.partial(fn, *args, **kwargs))
+
+
+async def upload_bytes_async(
+    key: str,
+    data: bytes,
+    content_type: str = "application/octet-stream",
+    *,
+    overwrite: bool = True,
+) -> str:
+    """Async r2.upload_bytes. Returns the key."""
+    return await _offload(r2.upload_bytes, key, data, content_type, overwrite=overwrite)
+
+
+async def download_bytes_async(key: str) -> bytes | bytearray:
+    """Async r2.download_bytes (a bytearray unless gzip-decoded). Raises if key does not exist."""
+    return await _offload(r2.download_bytes, key)
+
+
+async def exists_async(key: str) -> bool:
+    """Async r2.exists."""
+    return await _offload(r2.exists, key)
+
+
+async def delete_async(key: str) -> None:
+    """Async r2.delete. No-op if key does not exist."""
+    await _offload(r2.delete, key)
+
+
+async def upload_many(
+    items: Iterable[tuple[str, bytes, str]],
+    *,
+    overwrite: bool = True,
+) -> list[str]:
+    """
+    Upload (key, data, content_type) items concurrently, at most MAX_CONCURRENT_UPLOADS at a
+    time. Returns the keys in input order; the first failure propagates.
+    """
+    sem = asyncio.Semaphore(MAX_CONCURRENT_UPLOADS)
+
+    async def _one(key: str, data: bytes, content_type: str) -> str:
+        async with sem:
+            return await upload_bytes_async(key, data, content_type, overwrite=overwrite)
+
+    return list(await asyncio.gather(*(_one(*item) for item in items)))
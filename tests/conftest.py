@@ -1,18 +1,37 @@
 """Pytest configuration and fixtures for voice UX tests.
 
-Includes rate limiting support for Groq free tier (8000 TPM limit).
+Includes:
+- Agent and judge LLMs shared by the whole run (built once; the judge is None when no
+  API key is set)
+- Rate limiting support for Groq free tier (8000 TPM limit)
+- Slot prefetch disabled, so mocked slot tools are never bypassed by a live Cal.com request
 """
-import asyncio
 import os
-from typing import Generator
+import time
+from typing import AsyncIterator, Generator
 
 import pytest
+import pytest_asyncio
 
-from dotenv import load_dotenv
+from livekit.agents import llm
 
-# Load .env.local if present (same as main.py and session_factory)
-if os.path.exists(".env.local"):
-    load_dotenv(".env.local")
+from src.agents import portfolio_agent
+from src.agents.prompts.v2 import PORTFOLIO_ASSISTANT_INSTRUCTIONS
+from tests.helpers.env import load_local_env
+from tests.helpers.judge_cache import CachedJudgeLLM
+from tests.helpers.session_factory import create_agent_llm, create_judge_llm
+
+load_local_env()
+
+# Rough token cost of one agent turn: the instructions are resent each time (~4 chars per token).
+_TOKENS_PER_TURN = len(PORTFOLIO_ASSISTANT_INSTRUCTIONS) // 4
+
+# Default per-test cost (about two agent turns plus a judge call). Heavier tests declare
+# their own with @pytest.mark.llm_tokens(n).
+_DEFAULT_TEST_TOKENS = 2 * _TOKENS_PER_TURN + 1000
+
+# Token bucket refilled continuously at the TPM limit; starts full on the first test.
+_BUCKET: dict[str, float | None] = {"tokens": None, "last": time.monotonic()}
 
 
 def _is_using_groq() -> bool:
@@ -20,36 +39,56 @@ def _is_using_groq() -> bool:
     return bool(os.getenv("GROQ_API_KEY"))
 
 
-def _get_groq_delay_seconds() -> float:
-    """Get delay between tests when using Groq (to avoid rate limits).
+def _get_groq_tpm_limit() -> int:
+    """Get the tokens-per-minute budget to stay under when using Groq.
 
-    Default: 3.0 seconds (conservative for Groq free tier 8000 TPM limit).
-    Override via GROQ_TEST_DELAY_SECONDS env var (set to 0 to disable delay).
-
-    Rationale:
-    - Groq free tier: 8000 TPM (tokens per minute)
-    - Each test uses multiple LLM calls (session + judge); spacing them out
-      avoids bursting past the limit. 3s between tests keeps usage well under 8000 TPM.
+    Default: 8000 (Groq free tier). Override via GROQ_TPM_LIMIT env var
+    (set to 0 to disable throttling, e.g. on a paid tier).
     """
-    delay_str = os.getenv("GROQ_TEST_DELAY_SECONDS", "5.0")
     try:
-        return max(0.0, float(delay_str))
+        return max(0, int(os.getenv("GROQ_TPM_LIMIT", "8000")))
     except ValueError:
-        return 3.0
+        return 8000
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def agent_llm() -> AsyncIterator[llm.LLM]:
+    """LLM behind every test's AgentSession, opened once for the whole test run."""
+    async with create_agent_llm() as agent:
+        yield agent
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def judge_llm() -> AsyncIterator[CachedJudgeLLM | None]:
+    """Judge for the whole test run; LLM clients are reusable across tests."""
+    async with create_judge_llm() as judge:
+        yield judge
+
+
+@pytest.fixture(autouse=True)
+def no_slot_prefetch(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep the booking prefetch from calling Cal.com behind mock_tools' back."""
+    monkeypatch.setattr(portfolio_agent, "SLOT_PREFETCH_ENABLED", False)
 
 
 @pytest.fixture(autouse=True)
-def groq_rate_limit_delay() -> Generator[None, None, None]:
-    """Add delay between tests when using Groq to avoid rate limits.
+def groq_rate_limit_delay(request: pytest.FixtureRequest) -> Generator[None, None, None]:
+    """Throttle tests with a token bucket so usage stays under the Groq TPM limit.
 
-    This fixture runs automatically after each test (autouse=True).
-    Only adds delay if GROQ_API_KEY is set.
+    This fixture runs automatically before each test (autouse=True) and only sleeps
+    when the bucket is in debt, for exactly as long as the refill takes.
+    Only throttles if GROQ_API_KEY is set.
     """
-    yield  # Run the test first
-
-    # After test completes, add delay if using Groq (free tier 8000 TPM limit)
-    if _is_using_groq():
-        delay = _get_groq_delay_seconds()
-        if delay > 0:
-            import time
-            time.sleep(delay)
+    limit = _get_groq_tpm_limit()
+    if _is_using_groq() and limit:
+        marker = request.node.get_closest_marker("llm_tokens")
+        cost = marker.args[0] if marker else _DEFAULT_TEST_TOKENS
+
+        now = time.monotonic()
+        tokens = limit if _BUCKET["tokens"] is None else _BUCKET["tokens"]
+        tokens = min(limit, tokens + (now - _BUCKET["last"]) / 60 * limit) - cost
+        if tokens < 0:
+            time.sleep(-tokens / limit * 60)
+            now, tokens = time.monotonic(), 0.0
+        _BUCKET["tokens"], _BUCKET["last"] = tokens, now
+    yield
@@ -0,0 +1,15 @@
+"""Test helper: load .env.local once per test run."""
+import functools
+import os
+
+from dotenv import load_dotenv
+
+
+@functools.cache
+def load_local_env() -> None:
+    """Load .env.local the same way src/main.py does, so tests see the agent's API keys.
+
+    Variables already set in the environment win over the file.
+    """
+    if os.path.exists(".env.local"):
+        load_dotenv(".env.local", override=False)
@@ -0,0 +1,78 @@
+"""Test helper: compact assertions over RunResult events."""
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple
+
+if TYPE_CHECKING:
+    from livekit.agents.voice.run_result import RunEvent, RunResult
+
+
+def expect_tool_calls(result: RunResult, *names: str) -> None:
+    """Assert the next events are a call + output pair for each tool name, in order.
+
+    Advances result.expect past the pairs, so assertions on the following events
+    (e.g. the assistant's reply) continue from there.
+    """
+    expect = result.expect
+    for name in names:
+        expect.next_event().is_function_call(name=name)
+        expect.next_event().is_function_call_output()
+
+
+class EventMatcher(NamedTuple):
+    """One expected event: a description for failure messages and its predicate."""
+
+    description: str
+    matches: Callable[[RunEvent], bool]
+
+
+def message(role: str = "assistant") -> EventMatcher:
+    return EventMatcher(
+        f"message(role={role!r})",
+        lambda e: e.type == "message" and e.item.role == role,
+    )
+
+
+def tool_call(name: str, arguments: dict[str, Any] | None = None) -> EventMatcher:
+    """A call to tool `name`; with `arguments`, those keys must have exactly these values."""
+
+    def _matches(e: RunEvent) -> bool:
+        if e.type != "function_call" or e.item.name != name:
+            return False
+        if arguments is None:
+            return True
+        actual = json.loads(e.item.arguments or "{}")
+        return all(actual.get(key) == value for key, value in arguments.items())
+
+    suffix = f", arguments={arguments!r}" if arguments is not None else ""
+    return EventMatcher(f"tool_call({name!r}{suffix})", _matches)
+
+
+def tool_output() -> EventMatcher:
+    return EventMatcher("tool_output()", lambda e: e.type == "function_call_output")
+
+
+def assert_event_sequence(result: RunResult, *matchers: EventMatcher) -> list[RunEvent]:
+    """Assert the run produced exactly these events, in order, in one pass over result.events.
+
+    On mismatch the message lists the whole event trace next to the expectation.
+    Returns the events so callers can inspect items (e.g. the final message text).
+    """
+    events = list(result.events)
+    ok = len(events) == len(matchers) and all(
+        matcher.matches(event) for event, matcher in zip(events, matchers)
+    )
+    if not ok:
+        expected = "\n".join(f"  [{i}] {m.description}" for i, m in enumerate(matchers))
+        actual = "\n".join(f"  [{i}] {_describe(e)}" for i, e in enumerate(events))
+        raise AssertionError(f"event sequence mismatch\nexpected:\n{expected}\nactual:\n{actual}")
+    return events
+
+
+def _describe(e: RunEvent) -> str:
+    if e.type == "message":
+        return f"message(role={e.item.role!r}): {(e.item.text_content or '')[:80]!r}"
+    if e.type == "function_call":
+        return f"tool_call({e.item.name!r}, arguments={e.item.arguments})"
+    return e.type
@@ -0,0 +1,66 @@
+"""Test helper: judge LLM wrapper that caches verdicts across test runs.
+
+A verdict depends only on the assistant's reply text, the intent and the judge, so a run
+that produces the same reply as an earlier one replays the stored pass instead of calling
+the judge LLM again. Fails are never stored: a flaky verdict or a judge hiccup is retried
+on the next run rather than failing that reply forever.
+
+Cache: ~/.cache/voice-portfolio/judge.sqlite
+Set VOICE_PORTFOLIO_JUDGE_REFRESH=1 to ignore stored passes (they are overwritten).
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from livekit.agents import llm as llm_module
+
+if TYPE_CHECKING:
+    from livekit.agents.voice.run_result import ChatMessageAssert
+
+CACHE_PATH = Path.home() / ".cache" / "voice-portfolio" / "judge.sqlite"
+
+
+class CachedJudgeLLM:
+    """Wraps the judge LLM; use `await judge_llm.judge(msg_event, intent=...)`."""
+
+    def __init__(self, judge_llm: llm_module.LLM, judge_id: str) -> None:
+        self.llm = judge_llm
+        self._judge_id = judge_id
+        self._refresh = os.getenv("VOICE_PORTFOLIO_JUDGE_REFRESH") == "1"
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(CACHE_PATH)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS verdicts "
+            "(key TEXT PRIMARY KEY, verdict INT, rationale TEXT, ts REAL)"
+        )
+
+    def _key(self, text: str, intent: str) -> str:
+        return hashlib.sha256(f"{self._judge_id}||{text}||{intent}".encode()).hexdigest()
+
+    def _store_pass(self, key: str) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO verdicts VALUES (?, 1, '', ?)", (key, time.time())
+        )
+        self._db.commit()
+
+    async def judge(self, msg_event: ChatMessageAssert, *, intent: str) -> None:
+        """Same contract as msg_event.judge(llm, intent=...): raises AssertionError on a fail."""
+        key = self._key(msg_event.event().item.text_content or "", intent)
+        if not self._refresh:
+            # Fail rows written by older versions of this cache are ignored, not replayed.
+            row = self._db.execute(
+                "SELECT 1 FROM verdicts WHERE key = ? AND verdict = 1", (key,)
+            ).fetchone()
+            if row is not None:
+                return
+
+        await msg_event.judge(self.llm, intent=intent)
+        self._store_pass(key)
+
+    def close(self) -> None:
+        self._db.close()
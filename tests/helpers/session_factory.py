@@ -13,22 +13,38 @@ Env loading:
 - Mirrors src/main.py by loading .env.local if present, so tests see the same keys
   as the running agent server (e.g. GOOGLE_API_KEY for Gemini).
 """
+import functools
+import importlib
 import os
 from contextlib import asynccontextmanager
-from typing import AsyncIterator
+from types import ModuleType
+from typing import AsyncIterator, Literal
 
-from dotenv import load_dotenv
 from livekit.agents import AgentSession, llm as llm_module
 
-from src.agents.protfolio_agent import BookingUserData, PortfolioAssistant
+from src.agents.portfolio_agent import BookingUserData, PortfolioAssistant
+from tests.helpers.env import load_local_env
+from tests.helpers.judge_cache import CachedJudgeLLM
 
 # Load local env the same way src/main.py does, so tests pick up GEMINI / GROQ / OPENAI keys.
-if os.path.exists(".env.local"):
-    load_dotenv(".env.local")
-
-
+load_local_env()
+
+# Model per provider for the agent under test and for the judge.
+_SESSION_MODELS = {
+    "groq": "openai/gpt-oss-20b",
+    "google": "gemini-2.5-flash",
+    "openai": "gpt-4o-mini",
+}
+_JUDGE_MODELS = {
+    "groq": "llama-3.3-70b-versatile",
+    "google": "gemini-2.5-flash",
+    "openai": "gpt-4o-mini",
+}
+
+
+@functools.cache
 def _get_judge_provider() -> str | None:
-    """Detect which LLM provider API key is available.
+    """Detect which LLM provider API key is available (read once per test run).
 
     Returns:
         Provider name: "groq", "google", "openai", or None if no key found.
@@ -43,119 +59,109 @@ def _get_judge_provider() -> str | None:
     return None
 
 
+def _is_fast_mode() -> bool:
+    """Check if fast mode is enabled (structural assertions only, no judge)."""
+    return os.getenv("VOICE_PORTFOLIO_FAST") == "1"
+
+
 def _is_eval_mode() -> bool:
-    """Check if eval mode is enabled (requires any LLM API key)."""
-    return _get_judge_provider() is not None
+    """Check if eval mode is enabled (requires any LLM API key, off in fast mode)."""
+    return _get_judge_provider() is not None and not _is_fast_mode()
+
+
+@functools.cache
+def _load_plugin(provider: str) -> ModuleType:
+    """Import the livekit plugin for the provider on first use only."""
+    try:
+        return importlib.import_module(f"livekit.plugins.{provider}")
+    except ImportError:
+        raise ImportError(
+            f"{provider} plugin not installed. Install with: uv add 'livekit-agents[{provider}]~=1.3'"
+        )
+
+
+def _make_llm(purpose: Literal["session", "judge"]) -> llm_module.LLM:
+    """Build the LLM for the detected provider: the agent's model, or the judge's at temperature 0."""
+    provider = _get_judge_provider()
+    if provider not in _SESSION_MODELS:
+        raise RuntimeError(f"Unknown LLM provider in tests: {provider!r}")
+    plugin = _load_plugin(provider)
+    llm_cls = plugin.responses.LLM if provider == "openai" else plugin.LLM
+    if purpose == "judge":
+        return llm_cls(model=_JUDGE_MODELS[provider], temperature=0)
+    return llm_cls(model=_SESSION_MODELS[provider])
+
+
+@asynccontextmanager
+async def create_agent_llm() -> AsyncIterator[llm_module.LLM]:
+    """Create the LLM that drives PortfolioAssistant in tests.
+
+    Opened once per run by the session-scoped agent_llm fixture (tests/conftest.py) and
+    shared by every test session.
+
+    Yields:
+        LLM instance for the first provider with an API key.
+    """
+    # If no API key at all, we could still theoretically run with a dummy model,
+    # but for now require at least one provider for behavioral tests.
+    if not _get_judge_provider():
+        raise RuntimeError(
+            "No LLM API key found for tests. Set one of GROQ_API_KEY, GOOGLE_API_KEY, or OPENAI_API_KEY."
+        )
+
+    async with _make_llm("session") as llm:
+        yield llm
 
 
 @asynccontextmanager
 async def create_test_session(
+    agent_llm: llm_module.LLM,
     userdata: BookingUserData | None = None,
 ) -> AsyncIterator[AgentSession]:
     """Create an AgentSession for testing with PortfolioAssistant.
 
     Args:
+        agent_llm: LLM for the session, normally the agent_llm fixture.
         userdata: Optional BookingUserData to initialize the session with.
                   If None, creates a fresh BookingUserData instance.
 
     Yields:
-        AgentSession configured with PortfolioAssistant and a test LLM.
+        AgentSession configured with PortfolioAssistant and the given LLM. The fixed greeting
+        is already in the chat history (on_enter speaks it without the LLM), so tests can
+        send their first user turn directly.
     """
-    provider = _get_judge_provider()
-
-    # If no API key at all, we could still theoretically run with a dummy model,
-    # but for now require at least one provider for behavioral tests.
-    if not provider:
-        raise RuntimeError(
-            "No LLM API key found for tests. Set one of GROQ_API_KEY, GOOGLE_API_KEY, or OPENAI_API_KEY."
-        )
-
-    if provider == "groq":
-        from livekit.plugins import groq
-
-        async with groq.LLM(model="openai/gpt-oss-20b") as llm:
-            async with AgentSession(
-                llm=llm, userdata=userdata or BookingUserData()
-            ) as session:
-                await session.start(PortfolioAssistant())
-                yield session
-    elif provider == "google":
-        from livekit.plugins import google
-
-        async with google.LLM(model="gemini-2.5-flash") as llm:
-            async with AgentSession(
-                llm=llm, userdata=userdata or BookingUserData()
-            ) as session:
-                await session.start(PortfolioAssistant())
-                yield session
-    elif provider == "openai":
-        from livekit.plugins import openai
-
-        async with openai.responses.LLM(model="gpt-4o-mini") as llm:
-            async with AgentSession(
-                llm=llm, userdata=userdata or BookingUserData()
-            ) as session:
-                await session.start(PortfolioAssistant())
-                yield session
-    else:
-        raise RuntimeError(f"Unknown LLM provider in tests: {provider!r}")
+    async with AgentSession(
+        llm=agent_llm, userdata=userdata or BookingUserData()
+    ) as session:
+        await session.start(PortfolioAssistant())
+        yield session
 
 
 @asynccontextmanager
-async def create_judge_llm() -> AsyncIterator[llm_module.LLM | None]:
-    """Create an LLM instance for judge() evaluations, if eval mode is enabled.
+async def create_judge_llm() -> AsyncIterator[CachedJudgeLLM | None]:
+    """Create a judge for judge() evaluations, if eval mode is enabled.
 
     Supports multiple providers (priority order):
     - GROQ_API_KEY -> uses groq.LLM with llama-3.3-70b-versatile
-    - GOOGLE_API_KEY -> uses google.LLM with gemini-1.5-flash
+    - GOOGLE_API_KEY -> uses google.LLM with gemini-2.5-flash
     - OPENAI_API_KEY -> uses openai.responses.LLM with gpt-4o-mini
 
     Yields:
-        LLM instance if eval mode is enabled (API key present), None otherwise.
+        CachedJudgeLLM (verdicts cached across runs, see helpers/judge_cache.py) if eval
+        mode is enabled (API key present), None otherwise. Always None in fast mode
+        (VOICE_PORTFOLIO_FAST=1), so runs make no judge calls.
     """
     provider = _get_judge_provider()
-    if not provider:
+    if not provider or _is_fast_mode():
         yield None
         return
 
-    if provider == "groq":
-        try:
-            from livekit.plugins import groq
-
-            async with groq.LLM(
-                model="llama-3.3-70b-versatile", temperature=0
-            ) as llm:
-                yield llm
-        except ImportError:
-            raise ImportError(
-                "GROQ plugin not installed. Install with: uv add 'livekit-agents[groq]~=1.3'"
-            )
-    elif provider == "google":
+    async with _make_llm("judge") as llm:
+        judge = CachedJudgeLLM(llm, judge_id=f"{provider}:{_JUDGE_MODELS[provider]}")
         try:
-            from livekit.plugins import google
-
-            async with google.LLM(
-                model="gemini-2.5-flash", temperature=0
-            ) as llm:
-                yield llm
-        except ImportError:
-            raise ImportError(
-                "Google plugin not installed. Install with: uv add 'livekit-agents[google]~=1.3'"
-            )
-    elif provider == "openai":
-        try:
-            from livekit.plugins import openai
-
-            async with openai.responses.LLM(
-                model="gpt-4o-mini", temperature=0
-            ) as llm:
-                yield llm
-        except ImportError:
-            raise ImportError(
-                "OpenAI plugin not installed. Install with: uv add 'livekit-agents[openai]~=1.3'"
-            )
-    else:
-        yield None
+            yield judge
+        finally:
+            judge.close()
 
 
 def skip_if_no_judge() -> bool:
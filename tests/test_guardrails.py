@@ -0,0 +1,43 @@
+"""Static checks for the off-topic guardrail (no LLM required).
+
+Tests for:
+- First-person medical, legal and financial advice requests are classified
+- Portfolio, hiring and booking questions that mention those topics are not
+"""
+import pytest
+
+from src.agents.portfolio_agent import _classify_off_topic
+
+
+@pytest.mark.parametrize(
+    ("user_text", "category"),
+    [
+        ("Should I take ibuprofen or other pills for this headache?", "medical"),
+        ("Can you diagnose me? I have weird symptoms.", "medical"),
+        ("Am I liable if my landlord slips on the stairs?", "legal"),
+        ("Can I sue my previous employer?", "legal"),
+        ("Which stock should I buy this month?", "financial"),
+        ("Any stock tips for me?", "financial"),
+    ],
+)
+def test_advice_requests_are_off_topic(user_text: str, category: str) -> None:
+    """Test that first-person advice phrasing is redirected with the right category."""
+    assert _classify_off_topic(user_text) == category
+
+
+@pytest.mark.parametrize(
+    "user_text",
+    [
+        "How does Mihir diagnose production incidents?",
+        "what are the symptoms of bad architecture",
+        "Has he worked on crypto projects?",
+        "We're a crypto startup hiring backend engineers",
+        "Can I book a call to talk about our diagnostics platform?",
+        "Did he build anything for a legal-tech or fintech company?",
+        "Should I take a call with him next week?",
+        "",
+    ],
+)
+def test_portfolio_questions_are_not_off_topic(user_text: str) -> None:
+    """Test that questions about Mihir's work that mention those topics reach the LLM."""
+    assert _classify_off_topic(user_text) is None
@@ -0,0 +1,38 @@
+"""Static checks for the Layer-1 prompt (no LLM required).
+
+Tests for:
+- Instruction size budget (every byte is sent to the LLM on every turn)
+- Static prefix stays identical to the exported instructions
+- Fixed greeting: brief, introduces Melvin, asks one question
+"""
+import re
+
+from src.agents.prompts.v2 import (
+    GREETING_TEXT,
+    PORTFOLIO_ASSISTANT_INSTRUCTIONS,
+    STATIC_PREFIX,
+    build_core_instructions,
+)
+
+# Upper bound on the UTF-8 size of the core instructions. Raise deliberately, not by accident.
+INSTRUCTIONS_BYTE_BUDGET = 4800
+
+
+def test_instructions_within_byte_budget() -> None:
+    """Test that the core instructions do not silently grow."""
+    assert len(PORTFOLIO_ASSISTANT_INSTRUCTIONS.encode("utf-8")) < INSTRUCTIONS_BYTE_BUDGET
+
+
+def test_static_prefix_is_stable() -> None:
+    """Test that the cacheable prefix is the same object on every build."""
+    assert build_core_instructions() is STATIC_PREFIX
+    assert PORTFOLIO_ASSISTANT_INSTRUCTIONS == STATIC_PREFIX
+
+
+def test_greeting_is_brief_and_asks_one_question() -> None:
+    """Test that the spoken greeting is 1-3 plain sentences naming Melvin, ending in one question."""
+    sentences = [part for part in re.split(r"(?<=[.?!])\s+", GREETING_TEXT.strip()) if part]
+    assert 1 <= len(sentences) <= 3
+    assert "Melvin" in GREETING_TEXT
+    assert GREETING_TEXT.count("?") == 1 and GREETING_TEXT.rstrip().endswith("?")
+    assert not re.search(r"[*#`\n]|^\s*[-\d]", GREETING_TEXT)
@@ -0,0 +1,63 @@
+"""R2 storage checks against a stubbed S3 client (no network).
+
+Tests for:
+- exists_many lists one directory when every key shares it
+- exists_many falls back to per-key HEADs across directories (no bucket-wide listing)
+"""
+import pytest
+from botocore.exceptions import ClientError
+
+from src.storage import r2
+
+
+class StubS3Client:
+    """Records list and HEAD requests against an in-memory set of keys."""
+
+    def __init__(self, keys: set[str]) -> None:
+        self.keys = keys
+        self.listed_prefixes: list[str] = []
+        self.heads: list[str] = []
+
+    def get_paginator(self, operation: str) -> "StubS3Client":
+        assert operation == "list_objects_v2"
+        return self
+
+    def paginate(self, Bucket: str, Prefix: str, PaginationConfig: dict) -> list[dict]:
+        self.listed_prefixes.append(Prefix)
+        return [{"Contents": [{"Key": key} for key in sorted(self.keys) if key.startswith(Prefix)]}]
+
+    def head_object(self, Bucket: str, Key: str, **kwargs: str) -> dict:
+        self.heads.append(Key)
+        if Key not in self.keys:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return {"ETag": f'"{Key}"'}
+
+
+@pytest.fixture
+def stub_client(monkeypatch: pytest.MonkeyPatch) -> StubS3Client:
+    client = StubS3Client({"reports/roomA/x.json", "reports/roomB/y.json"})
+    monkeypatch.setattr(r2, "_client", lambda: client)
+    monkeypatch.setattr(r2, "_bucket", lambda: "test-bucket")
+    return client
+
+
+def test_exists_many_lists_a_shared_directory(stub_client: StubS3Client) -> None:
+    """Test that keys in one directory are answered by a single listing of that directory."""
+    result = r2.exists_many(["reports/roomA/x.json", "reports/roomA/missing.json"])
+
+    assert result == {"reports/roomA/x.json": True, "reports/roomA/missing.json": False}
+    assert stub_client.listed_prefixes == ["reports/roomA/"]
+    assert stub_client.heads == []
+
+
+def test_exists_many_heads_keys_across_directories(stub_client: StubS3Client) -> None:
+    """Test that keys sharing only a string prefix are HEADed instead of listing "reports/room"."""
+    result = r2.exists_many(["reports/roomA/x.json", "reports/roomB/y.json", "reports/roomC/z.json"])
+
+    assert result == {
+        "reports/roomA/x.json": True,
+        "reports/roomB/y.json": True,
+        "reports/roomC/z.json": False,
+    }
+    assert stub_client.listed_prefixes == []
+    assert stub_client.heads == ["reports/roomA/x.json", "reports/roomB/y.json", "reports/roomC/z.json"]
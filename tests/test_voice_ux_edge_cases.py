@@ -5,100 +5,84 @@ Tests for:
 - Confusion: apology + simpler restatement
 - Interruption: acknowledges "I might have spoken too long" and shortens
 - Just testing: polite, no booking push
-"""
-import pytest
-
-from tests.helpers.session_factory import create_judge_llm, create_test_session
-
-
-@pytest.mark.asyncio
-async def test_silence_empty_transcript() -> None:
-    """Test that silence/empty transcript gets a gentle nudge."""
-    async with create_test_session() as session, create_judge_llm() as judge_llm:
-        await session.run(user_input="")
-
-        # Empty or very short input
-        result = await session.run(user_input="")
-
-        msg_event = result.expect.next_event().is_message(role="assistant")
-
-        if judge_llm:
-            await msg_event.judge(
-                judge_llm,
-                intent=(
-                    "Should gently nudge or acknowledge silence. Should be brief and helpful. "
-                    "Should not be frustrated or pushy. May ask a simple question to re-engage."
-                ),
-            )
-
-        result.expect.no_more_events()
-
-
-@pytest.mark.asyncio
-async def test_confusion_apology_restatement() -> None:
-    """Test that confusion triggers apology and simpler restatement."""
-    async with create_test_session() as session, create_judge_llm() as judge_llm:
-        await session.run(user_input="")
-
-        # User expresses confusion
-        result = await session.run(user_input="I don't understand what you're saying")
-
-        msg_event = result.expect.next_event().is_message(role="assistant")
-
-        if judge_llm:
-            await msg_event.judge(
-                judge_llm,
-                intent=(
-                    "Should apologize briefly. Should restate the gist in simpler terms. "
-                    "Should offer one clear next option. Should be calm and helpful."
-                ),
-            )
-
-        result.expect.no_more_events()
 
+The scenarios are independent, so they run concurrently in one test: their agent
+and judge LLM round trips overlap instead of adding up.
+"""
+import asyncio
 
-@pytest.mark.asyncio
-async def test_interruption_acknowledgment() -> None:
-    """Test that interruption is acknowledged gracefully."""
-    async with create_test_session() as session, create_judge_llm() as judge_llm:
-        await session.run(user_input="")
-        await session.run(user_input="Tell me everything about Mihir")
+import pytest
 
-        # User interrupts (simulated by short response during long explanation)
-        result = await session.run(user_input="Wait, stop")
+from livekit.agents import llm
+
+from tests.helpers.judge_cache import CachedJudgeLLM
+from tests.helpers.session_factory import create_test_session
+
+# name -> (turns before the one under test, user input under test, judge intent)
+SCENARIOS: dict[str, tuple[tuple[str, ...], str, str]] = {
+    # Empty or very short input
+    "silence_empty_transcript": (
+        ("",),
+        "",
+        "Should gently nudge or acknowledge silence. Should be brief and helpful. "
+        "Should not be frustrated or pushy. May ask a simple question to re-engage.",
+    ),
+    # User expresses confusion
+    "confusion_apology_restatement": (
+        (),
+        "I don't understand what you're saying",
+        "Should apologize briefly. Should restate the gist in simpler terms. "
+        "Should offer one clear next option. Should be calm and helpful.",
+    ),
+    # User interrupts (simulated by short response during long explanation)
+    "interruption_acknowledgment": (
+        ("Tell me everything about Mihir",),
+        "Wait, stop",
+        "Should acknowledge the interruption gracefully. May mention "
+        "'I might have spoken too long' or similar. Should be brief going forward. "
+        "Should not be defensive.",
+    ),
+    "just_testing_polite_no_push": (
+        (),
+        "I'm just testing this out",
+        "Should respond politely. Should not push booking or be salesy. "
+        "Should be helpful but low-pressure. May acknowledge testing is fine.",
+    ),
+}
+
+
+async def _run_scenario(
+    prelude: tuple[str, ...],
+    user_input: str,
+    intent: str,
+    agent_llm: llm.LLM,
+    judge_llm: CachedJudgeLLM | None,
+) -> None:
+    """Run one scenario in its own session and assert a single judged assistant reply."""
+    async with create_test_session(agent_llm) as session:
+        for turn in prelude:
+            await session.run(user_input=turn)
+
+        result = await session.run(user_input=user_input)
 
         msg_event = result.expect.next_event().is_message(role="assistant")
 
         if judge_llm:
-            await msg_event.judge(
-                judge_llm,
-                intent=(
-                    "Should acknowledge the interruption gracefully. May mention "
-                    "'I might have spoken too long' or similar. Should be brief going forward. "
-                    "Should not be defensive."
-                ),
-            )
+            await judge_llm.judge(msg_event, intent=intent)
 
         result.expect.no_more_events()
 
 
-@pytest.mark.asyncio
-async def test_just_testing_polite_no_push() -> None:
-    """Test that 'just testing' gets a polite response without booking push."""
-    async with create_test_session() as session, create_judge_llm() as judge_llm:
-        await session.run(user_input="")
-
-        result = await session.run(user_input="I'm just testing this out")
-
-        msg_event = result.expect.next_event().is_message(role="assistant")
-
-        if judge_llm:
-            await msg_event.judge(
-                judge_llm,
-                intent=(
-                    "Should respond politely. Should not push booking or be salesy. "
-                    "Should be helpful but low-pressure. May acknowledge testing is fine."
-                ),
-            )
-
-        result.expect.no_more_events()
+@pytest.mark.llm_tokens(12000)
+async def test_ux_edge_cases(agent_llm: llm.LLM, judge_llm: CachedJudgeLLM | None) -> None:
+    """Test silence, confusion, interruption and 'just testing' replies concurrently."""
+    outcomes = await asyncio.gather(
+        *(_run_scenario(*scenario, agent_llm, judge_llm) for scenario in SCENARIOS.values()),
+        return_exceptions=True,
+    )
+    failures = {
+        name: outcome
+        for name, outcome in zip(SCENARIOS, outcomes)
+        if isinstance(outcome, BaseException)
+    }
+    assert not failures, "\n".join(f"{name}: {err!r}" for name, err in failures.items())